@@ -9,6 +9,7 @@ from app.api.models import (
     SQLFrameworkValidationRequest, SQLFrameworkValidationResponse,
     AvailableModelsResponse
 )
+from app.config import get_settings
 from app.core.llm_service import LLMService
 from app.dependencies import get_api_key, rate_limit
 from app.utils.schema_loader import get_available_schemas
@@ -25,6 +26,9 @@ from app.core.exceptions import (
 # Configuration du logger
 logger = logging.getLogger(__name__)
 
+# Mode debug figé au chargement (les settings sont immuables)
+_DEBUG = get_settings().DEBUG
+
 # Créer le routeur d'API
 router = APIRouter(
     tags=["nl2sql"],
@@ -740,10 +744,7 @@ async def get_detailed_service_status():
     À utiliser uniquement en développement.
     """
     # Vérifier que nous sommes en mode debug
-    from app.config import get_settings
-    settings = get_settings()
-    
-    if not settings.DEBUG:
+    if not _DEBUG:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Endpoint non disponible en production"
@@ -22,6 +22,7 @@ class Settings(BaseSettings):
     # Paramètres du modèle d'embedding
     EMBEDDING_MODEL: str = Field("text-embedding-004", env="EMBEDDING_MODEL")  # CHANGÉ
     EMBEDDING_PROVIDER: str = Field("google", env="EMBEDDING_PROVIDER")  # NOUVEAU
+    EMBEDDING_CACHE_SIZE: int = Field(4096, env="EMBEDDING_CACHE_SIZE")  # Entrées du cache mémoire (0 = désactivé)
     
     # Paramètres LLM
     DEFAULT_PROVIDER: str = Field("openai", env="DEFAULT_PROVIDER")
@@ -30,11 +31,23 @@ class Settings(BaseSettings):
     DEFAULT_GOOGLE_MODEL: str = Field("gemini-pro", env="DEFAULT_GOOGLE_MODEL")
     LLM_TEMPERATURE: float = Field(0.2, env="LLM_TEMPERATURE")
     LLM_TIMEOUT: int = Field(30, env="LLM_TIMEOUT")
+    LLM_CONCURRENCY: int = Field(30, env="LLM_CONCURRENCY")  # Connexions conservées dans le pool HTTP LLM
+    LLM_CACHE_SIZE: int = Field(1024, env="LLM_CACHE_SIZE")  # Réponses LLM en cache mémoire (0 = désactivé)
+    LLM_CACHE_TTL: int = Field(3600, env="LLM_CACHE_TTL")  # Durée de vie des réponses en cache (secondes)
+    THREAD_POOL_SIZE: int = Field(16, env="THREAD_POOL_SIZE")  # Threads du pool par défaut (appels bloquants)
+    FALLBACK_PROVIDER: Optional[str] = Field(None, env="FALLBACK_PROVIDER")  # Provider de secours si le circuit du provider demandé est ouvert
+    CIRCUIT_BREAKER_THRESHOLD: int = Field(5, env="CIRCUIT_BREAKER_THRESHOLD")  # Échecs consécutifs avant ouverture du circuit (0 = désactivé)
+    CIRCUIT_BREAKER_RESET_TIMEOUT: float = Field(30.0, env="CIRCUIT_BREAKER_RESET_TIMEOUT")  # Durée d'ouverture du circuit (secondes)
+    LLM_RATE_LIMIT_ENABLED: bool = Field(False, env="LLM_RATE_LIMIT_ENABLED")  # Limitation de débit côté client (RPM/TPM par provider)
+    LLM_MAX_CONCURRENT_PER_PROVIDER: int = Field(0, env="LLM_MAX_CONCURRENT_PER_PROVIDER")  # Appels simultanés maximum vers un même provider (0 = illimité)
+    LLM_HEALTH_CACHE_TTL: float = Field(60.0, env="LLM_HEALTH_CACHE_TTL")  # Durée de conservation de l'état de santé des providers (secondes, 0 = désactivé)
     
     # Paramètres de traduction
     EXACT_MATCH_THRESHOLD: float = Field(0.95, env="EXACT_MATCH_THRESHOLD")
     TOP_K_RESULTS: int = Field(5, env="TOP_K_RESULTS")
     SCHEMA_PATH: str = Field("app/schemas/datasulting.md", env="SCHEMA_PATH")
+    RELEVANCE_CLASSIFIER_ENABLED: bool = Field(False, env="RELEVANCE_CLASSIFIER_ENABLED")  # Questions nettement RH acceptées sans appel LLM
+    RELEVANCE_CLASSIFIER_MARGIN: float = Field(0.1, env="RELEVANCE_CLASSIFIER_MARGIN")  # Écart de similarité minimal (sinon vérification LLM)
     
     # Paramètres de l'API
     API_PREFIX: str = Field("/api/v1", env="API_PREFIX")
@@ -103,6 +116,7 @@ class Settings(BaseSettings):
         case_sensitive = True
         env_file_encoding = "utf-8"
         extra = "ignore"  # Ignore les champs supplémentaires non déclarés
+        frozen = True  # Singleton en lecture seule, partagé par tous les modules
 
 
 @lru_cache()
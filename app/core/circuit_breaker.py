@@ -0,0 +1,104 @@
+"""
+Disjoncteur (circuit breaker) pour les appels aux fournisseurs LLM.
+
+Après plusieurs échecs consécutifs (réseau, 5xx, 429), les appels vers un
+fournisseur sont refusés immédiatement pendant un délai de refroidissement
+au lieu d'attendre un timeout à chaque requête. Un appel d'essai est
+ensuite autorisé : s'il réussit le circuit se referme.
+
+Author: Datasulting
+Version: 2.0.0
+"""
+
+import logging
+import time
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+# États du disjoncteur
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur d'un fournisseur LLM.
+    
+    - CLOSED : appels autorisés, les échecs consécutifs sont comptés
+    - OPEN : appels refusés jusqu'à la fin du délai de refroidissement
+    - HALF_OPEN : un seul appel d'essai autorisé par délai de refroidissement
+    """
+    
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialise le disjoncteur.
+        
+        Args:
+            name: Nom du fournisseur protégé
+            failure_threshold: Échecs consécutifs avant ouverture (0 = désactivé)
+            reset_timeout: Délai avant un appel d'essai (secondes)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+    
+    def allow_request(self) -> bool:
+        """
+        Indique si un appel peut être envoyé au fournisseur.
+        
+        Returns:
+            True si l'appel est autorisé
+        """
+        if self.state == CLOSED:
+            return True
+        
+        now = time.monotonic()
+        if now - self._opened_at < self.reset_timeout:
+            return False
+        
+        # Fin du refroidissement : un appel d'essai (renouvelé si l'essai
+        # précédent n'a jamais abouti)
+        self.state = HALF_OPEN
+        self._opened_at = now
+        logger.info(f"Circuit {self.name} semi-ouvert, appel d'essai autorisé")
+        return True
+    
+    def record_success(self):
+        """Enregistre un appel abouti et referme le circuit."""
+        if self.state != CLOSED:
+            logger.info(f"Circuit {self.name} refermé")
+        self.state = CLOSED
+        self._failures = 0
+    
+    def record_failure(self):
+        """Enregistre un échec et ouvre le circuit si le seuil est atteint."""
+        if self.failure_threshold <= 0:
+            return
+        
+        self._failures += 1
+        if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(
+                    f"Circuit {self.name} ouvert après {self._failures} échecs consécutifs, "
+                    f"appels suspendus {self.reset_timeout}s"
+                )
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne l'état du disjoncteur.
+        
+        Returns:
+            Dictionnaire avec l'état et le nombre d'échecs consécutifs
+        """
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "failure_threshold": self.failure_threshold
+        }
@@ -9,13 +9,20 @@ Version: 2.0.0 - Gemini uniquement
 """
 
 import asyncio
-from typing import List, Optional
+from array import array
+from collections import OrderedDict
+from typing import List, Optional, Tuple
 import logging
 import aiohttp
-import json
+import base64
+import hashlib
+import math
+
+import orjson
 
 from app.config import get_settings
-from app.core.exceptions import EmbeddingError
+from app.core.exceptions import EmbeddingError, CacheError
+from app.utils.cache import cache_get, cache_set
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
@@ -23,6 +30,132 @@ logger = logging.getLogger(__name__)
 # Récupérer les paramètres de configuration
 settings = get_settings()
 
+# Constantes résolues une seule fois à l'import (les paramètres sont immuables)
+_EMBEDDING_MODEL = "text-embedding-004"
+_EMBEDDING_DIMENSIONS = settings.EMBEDDING_DIMENSIONS
+_EMBEDDING_CACHE_SIZE = settings.EMBEDDING_CACHE_SIZE
+_MODEL_RESOURCE = f"models/{_EMBEDDING_MODEL}"
+_EMBED_URL = f"https://generativelanguage.googleapis.com/v1beta/{_MODEL_RESOURCE}:embedContent"
+_BATCH_EMBED_URL = f"https://generativelanguage.googleapis.com/v1beta/{_MODEL_RESOURCE}:batchEmbedContents"
+_CACHE_KEY_PREFIX = f"emb:{_EMBEDDING_MODEL}:{_EMBEDDING_DIMENSIONS}:"
+
+# Cache LRU en mémoire : empreinte blake2b du texte -> vecteur (tuple immuable)
+_embedding_cache: "OrderedDict[bytes, Tuple[float, ...]]" = OrderedDict()
+
+# Session HTTP partagée (créée à la première requête, fermée à l'arrêt)
+_session: Optional[aiohttp.ClientSession] = None
+_session_lock = asyncio.Lock()
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """
+    Récupère ou crée la session HTTP partagée vers l'API Gemini.
+    
+    Une seule session pour tous les appels : les connexions TLS sont
+    réutilisées au lieu d'une poignée de main par requête.
+    
+    Returns:
+        Session aiohttp configurée
+    """
+    global _session
+    if _session is None or _session.closed:
+        async with _session_lock:
+            if _session is None or _session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=100,              # Maximum 100 connexions totales
+                    limit_per_host=50,      # Maximum 50 connexions vers l'API Gemini
+                    ttl_dns_cache=300,      # Cache DNS de 5 minutes
+                    keepalive_timeout=75    # Keep-alive de 75 secondes
+                )
+                # Clé API en en-tête plutôt que dans l'URL (absente des logs)
+                _session = aiohttp.ClientSession(
+                    connector=connector,
+                    headers={
+                        "Content-Type": "application/json",
+                        "x-goog-api-key": settings.GOOGLE_API_KEY or ""
+                    }
+                )
+                logger.debug("Session HTTP d'embedding créée")
+    return _session
+
+
+def _all_finite(values: List[float]) -> bool:
+    """Indique si toutes les valeurs sont des nombres finis."""
+    try:
+        return math.isfinite(sum(values))
+    except TypeError:
+        return False
+
+
+def _text_digest(text: str) -> bytes:
+    """Empreinte blake2b du texte, utilisée comme clé de cache."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+async def _get_cached_embedding(digest: bytes) -> Optional[List[float]]:
+    """
+    Cherche un embedding en mémoire puis dans Redis.
+    
+    Args:
+        digest: Empreinte du texte
+        
+    Returns:
+        Vecteur si présent dans l'un des caches, None sinon
+    """
+    cached = _embedding_cache.get(digest)
+    if cached is not None:
+        _embedding_cache.move_to_end(digest)
+        return list(cached)
+    
+    try:
+        entry = await cache_get(_CACHE_KEY_PREFIX + digest.hex())
+    except CacheError as e:
+        logger.warning(f"Cache Redis des embeddings indisponible: {e}")
+        return None
+    
+    if entry is None:
+        return None
+    
+    try:
+        embedding = array("f", base64.b64decode(entry["f32"])).tolist()
+    except (KeyError, TypeError, ValueError):
+        return None
+    
+    if len(embedding) != _EMBEDDING_DIMENSIONS:
+        return None
+    
+    _remember_embedding(digest, embedding)
+    return embedding
+
+
+def _remember_embedding(digest: bytes, embedding: List[float]) -> None:
+    """Ajoute un embedding au cache mémoire en évinçant l'entrée la plus ancienne."""
+    if _EMBEDDING_CACHE_SIZE <= 0:
+        return
+    _embedding_cache[digest] = tuple(embedding)
+    _embedding_cache.move_to_end(digest)
+    if len(_embedding_cache) > _EMBEDDING_CACHE_SIZE:
+        _embedding_cache.popitem(last=False)
+
+
+async def _store_cached_embedding(digest: bytes, embedding: List[float]) -> None:
+    """
+    Stocke un embedding en mémoire et dans Redis.
+    
+    Redis reçoit les octets float32 du vecteur (précision de l'API et de
+    Pinecone) : un hit Redis rend le même vecteur qu'un appel à l'API, quel
+    que soit le worker ou le niveau de cache qui répond.
+    """
+    _remember_embedding(digest, embedding)
+    
+    try:
+        await cache_set(
+            _CACHE_KEY_PREFIX + digest.hex(),
+            {"f32": base64.b64encode(array("f", embedding).tobytes()).decode("ascii")}
+        )
+    except CacheError as e:
+        logger.warning(f"Échec du stockage de l'embedding dans Redis: {e}")
+
 
 async def get_embedding(text: str) -> List[float]:
     """
@@ -39,10 +172,10 @@ async def get_embedding(text: str) -> List[float]:
     """
     # Validation des paramètres d'entrée
     if not text or not isinstance(text, str):
-        raise EmbeddingError("Le texte à vectoriser doit être une chaîne non vide", "text-embedding-004")
+        raise EmbeddingError("Le texte à vectoriser doit être une chaîne non vide", _EMBEDDING_MODEL)
     
-    if len(text.strip()) == 0:
-        raise EmbeddingError("Le texte à vectoriser ne peut pas être vide", "text-embedding-004")
+    if text.isspace():  # Pas de copie de la chaîne, arrêt au premier caractère non blanc
+        raise EmbeddingError("Le texte à vectoriser ne peut pas être vide", _EMBEDDING_MODEL)
     
     if len(text) > 8192:  # Limite Gemini
         logger.warning(f"Texte très long ({len(text)} caractères), troncature à 8192 caractères")
@@ -50,52 +183,62 @@ async def get_embedding(text: str) -> List[float]:
     
     # Vérifier que la clé API Google est disponible
     if not settings.GOOGLE_API_KEY:
-        raise EmbeddingError("GOOGLE_API_KEY manquante pour utiliser text-embedding-004", "text-embedding-004")
+        raise EmbeddingError("GOOGLE_API_KEY manquante pour utiliser text-embedding-004", _EMBEDDING_MODEL)
+    
+    # Court-circuiter l'API pour les textes déjà vectorisés
+    digest = _text_digest(text)
+    cached = await _get_cached_embedding(digest)
+    if cached is not None:
+        logger.debug(f"Embedding trouvé en cache pour texte: '{text[:30]}...'")
+        return cached
     
     logger.debug(f"Génération d'embedding Gemini pour texte: '{text[:30]}...' ({len(text)} caractères)")
     
     try:
-        # URL de l'API Gemini Embedding
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/text-embedding-004:embedContent?key={settings.GOOGLE_API_KEY}"
-        
         # Payload pour l'API Gemini
         payload = {
-            "model": "models/text-embedding-004",
+            "model": _MODEL_RESOURCE,
             "content": {
                 "parts": [{"text": text}]
-            }
-        }
-        
-        headers = {
-            "Content-Type": "application/json"
+            },
+            # Réduction côté serveur (Matryoshka) : moins d'octets transférés et stockés
+            "outputDimensionality": _EMBEDDING_DIMENSIONS
         }
         
         # Faire la requête
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, headers=headers, timeout=30) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(f"Erreur API Gemini {response.status}: {error_text}")
-                    raise EmbeddingError(f"Erreur API Gemini: {response.status} - {error_text}", "text-embedding-004")
-                
-                response_data = await response.json()
+        session = await _get_session()
+        async with session.post(_EMBED_URL, data=orjson.dumps(payload), timeout=30) as response:
+            # Lecture unique du corps brut (pas de décodage texte puis JSON)
+            raw = await response.read()
+            
+            if response.status != 200:
+                error_text = raw.decode("utf-8", "replace")
+                logger.error(f"Erreur API Gemini {response.status}: {error_text}")
+                raise EmbeddingError(f"Erreur API Gemini: {response.status} - {error_text}", _EMBEDDING_MODEL)
+        
+        try:
+            response_data = orjson.loads(raw)
+        except orjson.JSONDecodeError as e:
+            raise EmbeddingError(f"Réponse Gemini non JSON: {e}", _EMBEDDING_MODEL)
         
         # Extraire l'embedding de la réponse
         if 'embedding' not in response_data or 'values' not in response_data['embedding']:
             logger.error(f"Format de réponse Gemini invalide: {response_data}")
-            raise EmbeddingError("Format de réponse Gemini invalide", "text-embedding-004")
+            raise EmbeddingError("Format de réponse Gemini invalide", _EMBEDDING_MODEL)
         
         embedding = response_data['embedding']['values']
         
         # Vérifier que l'embedding est valide
         if not embedding or len(embedding) == 0:
-            raise EmbeddingError("L'embedding généré est vide", "text-embedding-004")
+            raise EmbeddingError("L'embedding généré est vide", _EMBEDDING_MODEL)
         
         # Vérifier que toutes les valeurs sont des nombres valides
-        if not all(isinstance(x, (int, float)) and not (isinstance(x, float) and (x != x or x == float('inf') or x == float('-inf'))) for x in embedding):
-            raise EmbeddingError("L'embedding contient des valeurs invalides (NaN ou infini)", "text-embedding-004")
+        # (une seule somme en C : NaN/infini se propagent au total)
+        if not _all_finite(embedding):
+            raise EmbeddingError("L'embedding contient des valeurs invalides (NaN ou infini)", _EMBEDDING_MODEL)
         
         logger.debug(f"Embedding Gemini généré avec succès (dimension: {len(embedding)})")
+        await _store_cached_embedding(digest, embedding)
         return embedding
     
     except EmbeddingError:
@@ -103,10 +246,157 @@ async def get_embedding(text: str) -> List[float]:
         raise
     except asyncio.CancelledError:
         logger.warning("Génération d'embedding Gemini annulée")
-        raise EmbeddingError("Génération d'embedding annulée", "text-embedding-004")
+        raise EmbeddingError("Génération d'embedding annulée", _EMBEDDING_MODEL)
     except Exception as e:
         logger.error(f"Erreur lors de la génération d'embedding Gemini: {str(e)}")
-        raise EmbeddingError(f"Erreur lors de la génération d'embedding Gemini: {str(e)}", "text-embedding-004")
+        raise EmbeddingError(f"Erreur lors de la génération d'embedding Gemini: {str(e)}", _EMBEDDING_MODEL)
+
+
+async def get_embeddings(texts: List[str], batch_size: int = 32) -> List[List[float]]:
+    """
+    Obtient les embeddings de plusieurs textes via l'endpoint batchEmbedContents.
+
+    Un seul aller-retour HTTP par lot au lieu d'un appel par texte.
+
+    Args:
+        texts: Textes à convertir en vecteurs
+        batch_size: Nombre de textes par requête (maximum 100 côté Gemini)
+
+    Returns:
+        Liste de vecteurs, dans le même ordre que les textes
+
+    Raises:
+        EmbeddingError: Si une erreur se produit lors de la vectorisation
+    """
+    if not texts:
+        return []
+
+    if not 1 <= batch_size <= 100:
+        raise EmbeddingError("batch_size doit être entre 1 et 100", _EMBEDDING_MODEL)
+
+    for text in texts:
+        if not text or not isinstance(text, str) or text.isspace():
+            raise EmbeddingError("Chaque texte à vectoriser doit être une chaîne non vide", _EMBEDDING_MODEL)
+
+    if not settings.GOOGLE_API_KEY:
+        raise EmbeddingError("GOOGLE_API_KEY manquante pour utiliser text-embedding-004", _EMBEDDING_MODEL)
+
+    texts = [text[:8192] for text in texts]  # Limite Gemini
+
+    logger.debug(f"Génération de {len(texts)} embeddings Gemini par lots de {batch_size}")
+
+    try:
+        embeddings: List[List[float]] = []
+        session = await _get_session()
+        
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            payload = {
+                "requests": [
+                    {
+                        "model": _MODEL_RESOURCE,
+                        "content": {"parts": [{"text": text}]},
+                        "outputDimensionality": _EMBEDDING_DIMENSIONS
+                    }
+                    for text in batch
+                ]
+            }
+            
+            async with session.post(_BATCH_EMBED_URL, data=orjson.dumps(payload), timeout=30) as response:
+                raw = await response.read()
+                
+                if response.status != 200:
+                    error_text = raw.decode("utf-8", "replace")
+                    logger.error(f"Erreur API Gemini {response.status}: {error_text}")
+                    raise EmbeddingError(f"Erreur API Gemini: {response.status} - {error_text}", _EMBEDDING_MODEL)
+            
+            try:
+                response_data = orjson.loads(raw)
+            except orjson.JSONDecodeError as e:
+                raise EmbeddingError(f"Réponse Gemini non JSON: {e}", _EMBEDDING_MODEL)
+            
+            batch_embeddings = [item.get('values') for item in response_data.get('embeddings', [])]
+            if len(batch_embeddings) != len(batch) or not all(batch_embeddings):
+                logger.error(f"Format de réponse Gemini invalide: {response_data}")
+                raise EmbeddingError("Format de réponse Gemini invalide", _EMBEDDING_MODEL)
+            
+            if not all(_all_finite(vector) for vector in batch_embeddings):
+                raise EmbeddingError("L'embedding contient des valeurs invalides (NaN ou infini)", _EMBEDDING_MODEL)
+            
+            embeddings.extend(batch_embeddings)
+        
+        logger.debug(f"{len(embeddings)} embeddings Gemini générés avec succès")
+        return embeddings
+
+    except EmbeddingError:
+        raise
+    except asyncio.CancelledError:
+        logger.warning("Génération d'embeddings Gemini annulée")
+        raise EmbeddingError("Génération d'embeddings annulée", _EMBEDDING_MODEL)
+    except Exception as e:
+        logger.error(f"Erreur lors de la génération d'embeddings Gemini: {str(e)}")
+        raise EmbeddingError(f"Erreur lors de la génération d'embeddings Gemini: {str(e)}", _EMBEDDING_MODEL)
+
+
+def quantize_embedding_int8(embedding: List[float], power: float = 1.0) -> Tuple[bytes, float, int]:
+    """
+    Quantifie un embedding sur 8 bits (affine min/max), 1 octet par dimension.
+    
+    Args:
+        embedding: Vecteur à quantifier
+        power: Exposant appliqué à |x| avant quantification (1.0 = affine
+            simple, 2.0 = meilleure résolution près de zéro)
+        
+    Returns:
+        Tuple (octets quantifiés, échelle, point zéro)
+    """
+    if power != 1.0:
+        embedding = [math.copysign(abs(x) ** (1.0 / power), x) for x in embedding]
+    
+    low = min(embedding)
+    high = max(embedding)
+    scale = (high - low) / 255 or 1.0
+    zero = round(-low / scale)
+    
+    q = bytes(min(255, max(0, round(x / scale + zero))) for x in embedding)
+    return q, scale, zero
+
+
+def dequantize_embedding_int8(q: bytes, scale: float, zero: int, power: float = 1.0) -> List[float]:
+    """
+    Reconstruit un embedding approché à partir de sa forme quantifiée 8 bits.
+    
+    Args:
+        q: Octets quantifiés
+        scale: Échelle retournée par quantize_embedding_int8
+        zero: Point zéro retourné par quantize_embedding_int8
+        power: Même exposant que lors de la quantification
+        
+    Returns:
+        Vecteur de flottants
+    """
+    embedding = [(b - zero) * scale for b in q]
+    if power != 1.0:
+        embedding = [math.copysign(abs(x) ** power, x) for x in embedding]
+    return embedding
+
+
+async def get_embedding_int8(text: str, power: float = 1.0) -> Tuple[bytes, float, int]:
+    """
+    Obtient un embedding quantifié sur 8 bits (4x plus compact que float32).
+    
+    Args:
+        text: Texte à convertir en vecteur
+        power: Voir quantize_embedding_int8
+        
+    Returns:
+        Tuple (octets quantifiés, échelle, point zéro)
+        
+    Raises:
+        EmbeddingError: Si une erreur se produit lors de la vectorisation
+    """
+    embedding = await get_embedding(text)
+    return quantize_embedding_int8(embedding, power)
 
 
 async def check_embedding_service() -> dict:
@@ -124,7 +414,7 @@ async def check_embedding_service() -> dict:
         if vector and len(vector) > 0:
             return {
                 "status": "ok",
-                "model": "text-embedding-004",
+                "model": _EMBEDDING_MODEL,
                 "provider": "google",
                 "dimensions": len(vector),
                 "test_successful": True
@@ -132,7 +422,7 @@ async def check_embedding_service() -> dict:
         else:
             return {
                 "status": "error",
-                "model": "text-embedding-004",
+                "model": _EMBEDDING_MODEL,
                 "provider": "google",
                 "message": "L'embedding généré est vide",
                 "test_successful": False
@@ -142,7 +432,7 @@ async def check_embedding_service() -> dict:
         logger.error(f"Erreur lors de la vérification du service d'embedding Gemini: {e}")
         return {
             "status": "error",
-            "model": "text-embedding-004",
+            "model": _EMBEDDING_MODEL,
             "provider": "google",
             "message": str(e),
             "test_successful": False
@@ -152,7 +442,7 @@ async def check_embedding_service() -> dict:
         logger.error(f"Erreur inattendue lors de la vérification du service d'embedding: {str(e)}")
         return {
             "status": "error",
-            "model": "text-embedding-004",
+            "model": _EMBEDDING_MODEL,
             "provider": "google",
             "message": f"Erreur inattendue: {str(e)}",
             "test_successful": False
@@ -171,7 +461,7 @@ async def get_model_info() -> dict:
         test_embedding = await get_embedding("test")
         
         model_info = {
-            "model_name": "text-embedding-004",
+            "model_name": _EMBEDDING_MODEL,
             "provider": "google",
             "embedding_dimension": len(test_embedding),
             "max_input_length": 8192,
@@ -200,8 +490,13 @@ async def get_model_info() -> dict:
 async def cleanup_embedding_service():
     """
     Nettoie les ressources du service d'embedding.
-    Pour Gemini API, pas de nettoyage spécial nécessaire.
+    Ferme la session HTTP partagée et vide le cache mémoire des embeddings.
     """
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _embedding_cache.clear()
     logger.info("Service d'embedding Gemini nettoyé")
 
 
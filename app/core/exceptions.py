@@ -18,7 +18,7 @@ class NL2SQLError(Exception):
     Toutes les autres exceptions de l'application héritent de cette classe
     pour permettre une gestion d'erreurs centralisée.
     """
-    pass
+    __slots__ = ()
 
 
 class LLMError(NL2SQLError):
@@ -31,6 +31,7 @@ class LLMError(NL2SQLError):
         status_code: Code de statut HTTP associé (défaut: 500)
         details: Informations supplémentaires sur l'erreur
     """
+    __slots__ = ("provider", "message", "status_code", "details")
     
     def __init__(
         self, 
@@ -43,7 +44,31 @@ class LLMError(NL2SQLError):
         self.message = message
         self.status_code = status_code
         self.details = details or {}
-        super().__init__(f"[{provider}] {message}")
+        super().__init__(provider, message)
+    
+    def __str__(self) -> str:
+        # Formaté uniquement si l'exception est affichée (la plupart sont
+        # interceptées puis journalisées une seule fois)
+        return f"[{self.provider}] {self.message}"
+    
+    def __reduce__(self):
+        # Pickle et copy reconstruisent l'exception à partir de ses attributs,
+        # sans repasser par le constructeur des sous-classes (qui préfixe le
+        # message ou impose son code de statut)
+        return (_rebuild_llm_error, (type(self), self.provider, self.message, self.status_code, self.details))
+
+
+def _rebuild_llm_error(
+    cls: type,
+    provider: str,
+    message: str,
+    status_code: int,
+    details: Dict[str, Any]
+) -> LLMError:
+    """Reconstruit une exception LLM sérialisée (voir LLMError.__reduce__)."""
+    error = cls.__new__(cls)
+    LLMError.__init__(error, provider, message, status_code, details)
+    return error
 
 
 class LLMNetworkError(LLMError):
@@ -52,6 +77,7 @@ class LLMNetworkError(LLMError):
     
     Levée quand une requête réseau échoue (timeout, connexion refusée, etc.)
     """
+    __slots__ = ()
     
     def __init__(self, provider: str, message: str, original_error: Optional[Exception] = None):
         details = {"original_error": str(original_error)} if original_error else {}
@@ -64,6 +90,7 @@ class LLMAuthError(LLMError):
     
     Levée quand la clé API est invalide, expirée ou manquante.
     """
+    __slots__ = ()
     
     def __init__(self, provider: str, message: str = "Clé API invalide ou expirée"):
         super().__init__(provider, message, 401)
@@ -75,9 +102,17 @@ class LLMQuotaError(LLMError):
     
     Levée quand les limites de l'API sont dépassées.
     """
+    __slots__ = ()
     
-    def __init__(self, provider: str, message: str = "Limite de débit ou quota dépassé"):
-        super().__init__(provider, message, 429)
+    def __init__(
+        self, 
+        provider: str, 
+        message: str = "Limite de débit ou quota dépassé",
+        retry_after: Optional[float] = None
+    ):
+        # Délai imposé par le fournisseur (en-tête Retry-After), si connu
+        details = {"retry_after": retry_after} if retry_after is not None else None
+        super().__init__(provider, message, 429, details)
 
 
 class LLMConfigError(LLMError):
@@ -86,6 +121,7 @@ class LLMConfigError(LLMError):
     
     Levée quand un fournisseur n'est pas configuré correctement.
     """
+    __slots__ = ()
     
     def __init__(self, provider: str, message: str):
         super().__init__(provider, f"Erreur de configuration: {message}", 500)
@@ -100,6 +136,7 @@ class ValidationError(NL2SQLError):
         field: Champ qui a échoué à la validation (optionnel)
         value: Valeur qui a échoué à la validation (optionnel)
     """
+    __slots__ = ("field", "value")
     
     def __init__(self, message: str, field: Optional[str] = None, value: Optional[Any] = None):
         self.field = field
@@ -116,6 +153,7 @@ class FrameworkError(ValidationError):
     
     Levée quand une requête SQL ne respecte pas les règles de sécurité obligatoires.
     """
+    __slots__ = ("sql_query",)
     
     def __init__(self, message: str, sql_query: Optional[str] = None):
         self.sql_query = sql_query
@@ -128,6 +166,7 @@ class EmbeddingError(NL2SQLError):
     
     Levée quand la génération d'embeddings échoue.
     """
+    __slots__ = ("model_name",)
     
     def __init__(self, message: str, model_name: Optional[str] = None):
         self.model_name = model_name
@@ -143,6 +182,7 @@ class VectorSearchError(NL2SQLError):
     
     Levée quand les opérations Pinecone échouent.
     """
+    __slots__ = ("index_name",)
     
     def __init__(self, message: str, index_name: Optional[str] = None):
         self.index_name = index_name
@@ -158,6 +198,7 @@ class CacheError(NL2SQLError):
     
     Levée quand les opérations Redis échouent (non critique).
     """
+    __slots__ = ("operation",)
     
     def __init__(self, message: str, operation: Optional[str] = None):
         self.operation = operation
@@ -173,6 +214,7 @@ class SchemaError(NL2SQLError):
     
     Levée quand le fichier de schéma est introuvable ou invalide.
     """
+    __slots__ = ("schema_path",)
     
     def __init__(self, message: str, schema_path: Optional[str] = None):
         self.schema_path = schema_path
@@ -10,10 +10,11 @@ Version: 2.0.0
 
 import asyncio
 import logging
+import random
 import time
-from typing import Dict, Any, Optional, Union
-import aiohttp
-import json
+from typing import AsyncIterator, Dict, Any, Optional, Union
+import httpx
+import orjson
 
 from .exceptions import (
     LLMError, LLMNetworkError, LLMAuthError, 
@@ -22,82 +23,175 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Délais de backoff exponentiel précalculés, indexés par numéro de tentative
+_BACKOFF = (1, 2, 4, 8, 16)
+
+# Délai maximal accepté depuis un en-tête Retry-After (secondes)
+_MAX_RETRY_AFTER = 30
+
+# Attente cumulée maximale sur des 429 au sein d'une requête (secondes) :
+# au-delà, l'erreur est remontée immédiatement et la saturation durable est
+# gérée par le limiteur de débit et le disjoncteur de la factory
+_MAX_RATE_LIMIT_WAIT = 5.0
+
+# Délai maximal d'établissement d'une connexion TCP/TLS (secondes)
+_CONNECT_TIMEOUT = 5.0
+
+# Erreurs serveur transitoires : seules celles-ci sont réessayées
+# (un 500 est généralement déterministe et échouerait à nouveau)
+_RETRYABLE_STATUSES = frozenset({502, 503, 504})
+
+
+def _raise_unauthorized(provider: str, response: httpx.Response):
+    raise LLMAuthError(provider, "Clé API invalide ou expirée")
+
+
+def _raise_forbidden(provider: str, response: httpx.Response):
+    raise LLMAuthError(provider, "Accès non autorisé")
+
+
+def _raise_rate_limited(provider: str, response: httpx.Response):
+    # Extraction du retry-after si présent
+    retry_after = response.headers.get("Retry-After", "60")
+    # Délai exploitable par le limiteur de débit (uniquement s'il est annoncé)
+    delay = None
+    if "Retry-After" in response.headers:
+        try:
+            delay = min(max(float(retry_after), 0.0), _MAX_RETRY_AFTER)
+        except ValueError:
+            pass
+    raise LLMQuotaError(
+        provider,
+        f"Limite de débit dépassée. Réessayez dans {retry_after}s",
+        retry_after=delay
+    )
+
+
+# Codes HTTP avec un traitement dédié (429 après épuisement des tentatives)
+_STATUS_HANDLERS = {
+    401: _raise_unauthorized,
+    403: _raise_forbidden,
+    429: _raise_rate_limited,
+}
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Délai de backoff exponentiel avec gigue pour une tentative donnée."""
+    # La gigue évite que les clients en échec réessaient tous au même instant
+    return _BACKOFF[min(attempt, len(_BACKOFF) - 1)] + random.uniform(0, 0.5)
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """
+    Délai avant nouvelle tentative, en respectant Retry-After si présent.
+    
+    Le délai imposé par le serveur est plafonné pour ne pas bloquer la
+    requête trop longtemps.
+    """
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is None:
+        return _backoff_delay(attempt)
+    try:
+        return min(max(float(retry_after), 0.0), _MAX_RETRY_AFTER)
+    except ValueError:
+        return _backoff_delay(attempt)
+
+
+def _error_detail(raw: bytes) -> str:
+    """Extrait un détail lisible d'un corps de réponse en erreur."""
+    try:
+        error_data = orjson.loads(raw)
+        if isinstance(error_data, dict) and "error" in error_data:
+            return f": {error_data['error']}"
+    except orjson.JSONDecodeError:
+        if raw:
+            return f": {raw[:200].decode('utf-8', 'replace')}"
+    return ""
+
 
 class HTTPClient:
     """
     Client HTTP centralisé avec gestion d'erreurs uniforme et optimisations.
     
     Fonctionnalités:
-    - Pool de connexions réutilisables
+    - Pool de connexions réutilisables (HTTP/2 multiplexé)
     - Gestion d'erreurs spécialisée par code HTTP
     - Retry automatique avec backoff exponentiel
     - Logging détaillé des requêtes
     - Timeout configurables
     """
     
-    def __init__(self, max_retries: int = 3, base_timeout: int = 30):
+    def __init__(self, max_retries: int = 3, base_timeout: int = 30, max_keepalive_connections: int = 30):
         """
         Initialise le client HTTP.
         
         Args:
             max_retries: Nombre maximum de tentatives en cas d'échec
             base_timeout: Timeout de base en secondes
+            max_keepalive_connections: Connexions conservées ouvertes dans le pool
         """
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._session: Optional[httpx.AsyncClient] = None
+        self._session_ready = False
         self._lock = asyncio.Lock()
         self.max_retries = max_retries
         self.base_timeout = base_timeout
+        self.max_keepalive_connections = max_keepalive_connections
         
         # Statistiques de performance (optionnel pour monitoring)
-        self.stats = {
-            "total_requests": 0,
-            "successful_requests": 0,
-            "failed_requests": 0,
-            "total_response_time": 0.0
-        }
+        # Compteurs en attributs simples : le total est dérivé à la lecture
+        self._successful_requests = 0
+        self._failed_requests = 0
+        self._total_response_time = 0.0
     
-    async def _get_session(self) -> aiohttp.ClientSession:
+    async def _get_session(self) -> httpx.AsyncClient:
         """
-        Récupère ou crée une session HTTP (thread-safe).
+        Récupère ou crée le client HTTP (thread-safe).
         
-        La session est créée avec des optimisations de performance:
+        Le client est créé avec des optimisations de performance:
+        - HTTP/2 : les requêtes simultanées vers un même fournisseur sont
+          multiplexées sur une seule connexion TLS
         - Pool de connexions avec limites appropriées
-        - Cache DNS activé
         - Timeouts configurés
         
         Returns:
-            Session aiohttp configurée
+            Client httpx configuré
         """
-        if self._session is None or self._session.closed:
-            async with self._lock:
-                if self._session is None or self._session.closed:
-                    # Configuration optimisée du connecteur
-                    connector = aiohttp.TCPConnector(
-                        limit=100,              # Maximum 100 connexions totales
-                        limit_per_host=30,      # Maximum 30 connexions par host
-                        ttl_dns_cache=300,      # Cache DNS de 5 minutes
-                        use_dns_cache=True,     # Activer le cache DNS
-                        enable_cleanup_closed=True,  # Nettoyage automatique
-                        keepalive_timeout=30    # Keep-alive de 30 secondes
-                    )
-                    
-                    # Timeout global pour la session
-                    timeout = aiohttp.ClientTimeout(total=60)
-                    
-                    self._session = aiohttp.ClientSession(
-                        connector=connector,
-                        timeout=timeout,
-                        headers={
-                            "User-Agent": "NL2SQL-API/2.0.0",
-                            "Accept": "application/json",
-                            "Accept-Encoding": "gzip, deflate"
-                        }
-                    )
-                    
-                    logger.debug("Session HTTP créée avec optimisations")
+        # Chemin rapide : le client est créé une seule fois
+        if self._session_ready:
+            return self._session
+        
+        async with self._lock:
+            if not self._session_ready:
+                # Configuration optimisée du pool de connexions
+                limits = httpx.Limits(
+                    max_connections=100,    # Maximum 100 connexions totales
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=60     # Keep-alive de 60 secondes (évite une poignée de main TLS entre deux rafales)
+                )
+                
+                self._session = httpx.AsyncClient(
+                    http2=True,
+                    limits=limits,
+                    timeout=httpx.Timeout(60.0, connect=_CONNECT_TIMEOUT),  # Timeout global
+                    headers={
+                        "User-Agent": "NL2SQL-API/2.0.0",
+                        "Accept": "application/json"
+                    }
+                )
+                
+                self._session_ready = True
+                logger.debug("Client HTTP/2 créé avec optimisations")
         
         return self._session
     
+    async def startup(self):
+        """
+        Pré-crée la session HTTP au démarrage de l'application.
+        
+        Évite le coût de création de la session sur la première requête.
+        """
+        await self._get_session()
+    
     async def post_json(
         self,
         url: str,
@@ -130,14 +224,19 @@ class HTTPClient:
         timeout = timeout or self.base_timeout
         session = await self._get_session()
         
+        # Sérialisation unique du payload (réutilisée à chaque tentative)
+        data = orjson.dumps(payload)
+        request_headers = {**headers, "Content-Type": "application/json"}
+        
         # Logging de la requête (sans données sensibles)
         logger.debug(
             f"[{provider}] POST {url} - Headers: {len(headers)} - "
-            f"Payload size: {len(str(payload))} chars - Timeout: {timeout}s"
+            f"Payload size: {len(data)} bytes - Timeout: {timeout}s"
         )
         
         start_time = time.time()
         last_exception = None
+        rate_limit_wait = 0.0
         
         # Retry loop avec backoff exponentiel
         for attempt in range(self.max_retries if retry_on_failure else 1):
@@ -145,100 +244,90 @@ class HTTPClient:
                 # Calculer le timeout pour cette tentative
                 attempt_timeout = timeout + (attempt * 5)  # +5s par tentative
                 
-                async with session.post(
+                response = await session.post(
                     url,
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=attempt_timeout)
-                ) as response:
-                    
-                    response_time = time.time() - start_time
-                    
-                    # Lecture de la réponse
-                    try:
-                        response_text = await response.text()
-                    except Exception as e:
-                        logger.error(f"[{provider}] Impossible de lire la réponse: {e}")
-                        raise LLMNetworkError(provider, "Réponse illisible", e)
+                    headers=request_headers,
+                    content=data,
+                    timeout=httpx.Timeout(attempt_timeout, connect=_CONNECT_TIMEOUT)
+                )
+                
+                response_time = time.time() - start_time
+                
+                # Corps brut déjà lu par httpx (orjson parse directement les octets)
+                raw = response.content
+                
+                # Logging de la réponse
+                logger.debug(
+                    f"[{provider}] Response {response.status_code} - "
+                    f"Size: {len(raw)} bytes - Time: {response_time:.2f}s"
+                )
+                
+                # Gestion des codes d'erreur HTTP (une seule comparaison sur le chemin nominal)
+                status = response.status_code
+                if status != 200:
+                    # Limite de débit : nouvelle tentative après le délai annoncé
+                    # (Retry-After) ou un backoff avec gigue, sauf dernière tentative
+                    # ou attente cumulée trop longue pour une requête interactive
+                    if status == 429 and attempt < self.max_retries - 1 and retry_on_failure:
+                        wait_time = _retry_delay(response, attempt)
+                        if rate_limit_wait + wait_time > _MAX_RATE_LIMIT_WAIT:
+                            _raise_rate_limited(provider, response)
+                        rate_limit_wait += wait_time
+                        logger.warning(
+                            f"[{provider}] Limite de débit atteinte. Tentative {attempt + 1}/{self.max_retries}. "
+                            f"Nouvelle tentative dans {wait_time:.1f}s"
+                        )
+                        await asyncio.sleep(wait_time)
+                        continue
                     
-                    # Logging de la réponse
-                    logger.debug(
-                        f"[{provider}] Response {response.status} - "
-                        f"Size: {len(response_text)} chars - Time: {response_time:.2f}s"
-                    )
+                    handler = _STATUS_HANDLERS.get(status)
+                    if handler is not None:
+                        handler(provider, response)
                     
-                    # Gestion des codes d'erreur HTTP
-                    if response.status == 401:
-                        raise LLMAuthError(provider, "Clé API invalide ou expirée")
-                    elif response.status == 403:
-                        raise LLMAuthError(provider, "Accès non autorisé")
-                    elif response.status == 429:
-                        # Extraction du retry-after si présent
-                        retry_after = response.headers.get("Retry-After", "60")
-                        raise LLMQuotaError(
-                            provider, 
-                            f"Limite de débit dépassée. Réessayez dans {retry_after}s"
-                        )
-                    elif 500 <= response.status <= 599:
-                        error_msg = f"Erreur serveur {response.status}"
-                        try:
-                            error_data = json.loads(response_text)
-                            if "error" in error_data:
-                                error_msg += f": {error_data['error']}"
-                        except json.JSONDecodeError:
-                            if response_text:
-                                error_msg += f": {response_text[:200]}"
+                    if status >= 500:
+                        error_msg = f"Erreur serveur {status}{_error_detail(raw)}"
                         
-                        # Retry automatique pour les erreurs serveur (sauf dernière tentative)
-                        if attempt < self.max_retries - 1 and retry_on_failure:
-                            wait_time = (2 ** attempt)  # Backoff exponentiel: 1s, 2s, 4s...
+                        # Retry automatique pour les erreurs transitoires (sauf dernière tentative)
+                        if status in _RETRYABLE_STATUSES and attempt < self.max_retries - 1 and retry_on_failure:
+                            wait_time = _retry_delay(response, attempt)
                             logger.warning(
                                 f"[{provider}] {error_msg}. Tentative {attempt + 1}/{self.max_retries}. "
-                                f"Nouvelle tentative dans {wait_time}s"
+                                f"Nouvelle tentative dans {wait_time:.1f}s"
                             )
                             await asyncio.sleep(wait_time)
                             continue
                         
                         raise LLMNetworkError(provider, error_msg)
-                    elif response.status != 200:
-                        # Autres codes d'erreur
-                        error_msg = f"HTTP {response.status}"
-                        try:
-                            error_data = json.loads(response_text)
-                            if "error" in error_data:
-                                error_msg += f": {error_data['error']}"
-                        except json.JSONDecodeError:
-                            if response_text:
-                                error_msg += f": {response_text[:200]}"
-                        
-                        raise LLMError(provider, error_msg, response.status)
-                    
-                    # Parsing de la réponse JSON
-                    try:
-                        response_data = json.loads(response_text)
-                    except json.JSONDecodeError as e:
-                        logger.error(f"[{provider}] Réponse JSON invalide: {e}")
-                        raise LLMError(provider, f"Réponse JSON invalide: {e}", 502)
                     
-                    # Mise à jour des statistiques
-                    self._update_stats(True, response_time)
-                    
-                    logger.info(
-                        f"[{provider}] Requête réussie en {response_time:.2f}s "
-                        f"(tentative {attempt + 1})"
-                    )
-                    
-                    return response_data
+                    # Autres codes d'erreur
+                    raise LLMError(provider, f"HTTP {status}{_error_detail(raw)}", status)
+                
+                # Parsing de la réponse JSON
+                try:
+                    response_data = orjson.loads(raw)
+                except orjson.JSONDecodeError as e:
+                    logger.error(f"[{provider}] Réponse JSON invalide: {e}")
+                    raise LLMError(provider, f"Réponse JSON invalide: {e}", 502)
+                
+                # Mise à jour des statistiques
+                self._update_stats(True, response_time)
+                
+                logger.info(
+                    f"[{provider}] Requête réussie en {response_time:.2f}s "
+                    f"(tentative {attempt + 1})"
+                )
+                
+                return response_data
             
-            except (asyncio.TimeoutError, aiohttp.ServerTimeoutError) as e:
+            except (asyncio.TimeoutError, httpx.TimeoutException) as e:
                 last_exception = e
                 error_msg = f"Timeout après {attempt_timeout}s"
                 
                 if attempt < self.max_retries - 1 and retry_on_failure:
-                    wait_time = (2 ** attempt)
+                    wait_time = _backoff_delay(attempt)
                     logger.warning(
                         f"[{provider}] {error_msg}. Tentative {attempt + 1}/{self.max_retries}. "
-                        f"Nouvelle tentative dans {wait_time}s"
+                        f"Nouvelle tentative dans {wait_time:.1f}s"
                     )
                     await asyncio.sleep(wait_time)
                     continue
@@ -246,15 +335,15 @@ class HTTPClient:
                 self._update_stats(False, time.time() - start_time)
                 raise LLMNetworkError(provider, error_msg, e)
             
-            except (aiohttp.ClientError, aiohttp.ClientConnectionError) as e:
+            except httpx.TransportError as e:
                 last_exception = e
                 error_msg = f"Erreur de connexion: {str(e)}"
                 
                 if attempt < self.max_retries - 1 and retry_on_failure:
-                    wait_time = (2 ** attempt)
+                    wait_time = _backoff_delay(attempt)
                     logger.warning(
                         f"[{provider}] {error_msg}. Tentative {attempt + 1}/{self.max_retries}. "
-                        f"Nouvelle tentative dans {wait_time}s"
+                        f"Nouvelle tentative dans {wait_time:.1f}s"
                     )
                     await asyncio.sleep(wait_time)
                     continue
@@ -273,9 +362,9 @@ class HTTPClient:
                 logger.error(f"[{provider}] {error_msg}", exc_info=True)
                 
                 if attempt < self.max_retries - 1 and retry_on_failure:
-                    wait_time = (2 ** attempt)
+                    wait_time = _backoff_delay(attempt)
                     logger.warning(
-                        f"[{provider}] Nouvelle tentative dans {wait_time}s"
+                        f"[{provider}] Nouvelle tentative dans {wait_time:.1f}s"
                     )
                     await asyncio.sleep(wait_time)
                     continue
@@ -290,15 +379,159 @@ class HTTPClient:
         else:
             raise LLMError(provider, f"Échec après {self.max_retries} tentatives", 500)
     
+    async def get_json(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        timeout: int = None,
+        provider: str = "unknown"
+    ) -> Dict[str, Any]:
+        """
+        Effectue une requête GET JSON, sans retry.
+        
+        Destinée aux appels légers (health checks) : un échec est signalé
+        immédiatement plutôt que réessayé.
+        
+        Args:
+            url: URL de destination
+            headers: En-têtes HTTP
+            timeout: Timeout spécifique (utilise base_timeout si None)
+            provider: Nom du fournisseur pour les logs et erreurs
+            
+        Returns:
+            Réponse JSON désérialisée
+            
+        Raises:
+            LLMAuthError: Erreur d'authentification (401, 403)
+            LLMQuotaError: Limite de débit dépassée (429)
+            LLMNetworkError: Erreur réseau ou serveur (5xx, timeout)
+            LLMError: Autres erreurs HTTP
+        """
+        timeout = timeout or self.base_timeout
+        session = await self._get_session()
+        
+        try:
+            response = await session.get(
+                url,
+                headers=headers,
+                timeout=httpx.Timeout(timeout, connect=_CONNECT_TIMEOUT)
+            )
+        except httpx.TimeoutException as e:
+            raise LLMNetworkError(provider, f"Timeout après {timeout}s", e)
+        except httpx.TransportError as e:
+            raise LLMNetworkError(provider, f"Erreur de connexion: {str(e)}", e)
+        
+        raw = response.content
+        status = response.status_code
+        if status != 200:
+            handler = _STATUS_HANDLERS.get(status)
+            if handler is not None:
+                handler(provider, response)
+            if status >= 500:
+                raise LLMNetworkError(provider, f"Erreur serveur {status}{_error_detail(raw)}")
+            raise LLMError(provider, f"HTTP {status}{_error_detail(raw)}", status)
+        
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError as e:
+            raise LLMError(provider, f"Réponse JSON invalide: {e}", 502)
+    
+    async def stream_sse(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: Optional[int] = None,
+        provider: str = "unknown"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Effectue une requête POST en streaming (Server-Sent Events).
+        
+        Chaque événement `data:` est désérialisé et transmis dès sa réception.
+        Aucune nouvelle tentative : une partie de la réponse a pu être
+        transmise à l'appelant.
+        
+        Args:
+            url: URL de destination
+            headers: En-têtes HTTP
+            payload: Données JSON à envoyer
+            timeout: Délai maximal entre deux lectures (utilise base_timeout si None)
+            provider: Nom du fournisseur pour les logs et erreurs
+            
+        Yields:
+            Événements JSON désérialisés
+            
+        Raises:
+            LLMAuthError: Erreur d'authentification (401, 403)
+            LLMQuotaError: Limite de débit dépassée (429)
+            LLMNetworkError: Erreur réseau ou serveur (5xx, timeout)
+            LLMError: Autres erreurs HTTP
+        """
+        timeout = timeout or self.base_timeout
+        session = await self._get_session()
+        request_headers = {**headers, "Content-Type": "application/json", "Accept": "text/event-stream"}
+        
+        start_time = time.time()
+        success = False
+        try:
+            async with session.stream(
+                "POST",
+                url,
+                headers=request_headers,
+                content=orjson.dumps(payload),
+                timeout=httpx.Timeout(timeout, connect=_CONNECT_TIMEOUT)
+            ) as response:
+                status = response.status_code
+                if status != 200:
+                    raw = await response.aread()
+                    handler = _STATUS_HANDLERS.get(status)
+                    if handler is not None:
+                        handler(provider, response)
+                    if status >= 500:
+                        raise LLMNetworkError(provider, f"Erreur serveur {status}{_error_detail(raw)}")
+                    raise LLMError(provider, f"HTTP {status}{_error_detail(raw)}", status)
+                
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        yield orjson.loads(data)
+                    except orjson.JSONDecodeError as e:
+                        raise LLMError(provider, f"Événement de streaming invalide: {e}", 502)
+            
+            success = True
+            logger.info(f"[{provider}] Streaming terminé en {time.time() - start_time:.2f}s")
+        
+        except (asyncio.TimeoutError, httpx.TimeoutException) as e:
+            raise LLMNetworkError(provider, f"Timeout après {timeout}s", e)
+        
+        except httpx.TransportError as e:
+            raise LLMNetworkError(provider, f"Erreur de connexion: {str(e)}", e)
+        
+        finally:
+            self._update_stats(success, time.time() - start_time)
+    
     def _update_stats(self, success: bool, response_time: float):
         """Met à jour les statistiques de performance."""
-        self.stats["total_requests"] += 1
-        self.stats["total_response_time"] += response_time
+        self._total_response_time += response_time
         
         if success:
-            self.stats["successful_requests"] += 1
+            self._successful_requests += 1
         else:
-            self.stats["failed_requests"] += 1
+            self._failed_requests += 1
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs bruts, construits à la demande."""
+        return {
+            "total_requests": self._successful_requests + self._failed_requests,
+            "successful_requests": self._successful_requests,
+            "failed_requests": self._failed_requests,
+            "total_response_time": self._total_response_time
+        }
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -307,23 +540,24 @@ class HTTPClient:
         Returns:
             Dictionnaire avec les métriques de performance
         """
-        total_requests = self.stats["total_requests"]
+        total_requests = self._successful_requests + self._failed_requests
         if total_requests == 0:
             return {"message": "Aucune requête effectuée"}
         
         return {
             "total_requests": total_requests,
-            "successful_requests": self.stats["successful_requests"],
-            "failed_requests": self.stats["failed_requests"],
-            "success_rate": self.stats["successful_requests"] / total_requests * 100,
-            "average_response_time": self.stats["total_response_time"] / total_requests
+            "successful_requests": self._successful_requests,
+            "failed_requests": self._failed_requests,
+            "success_rate": self._successful_requests / total_requests * 100,
+            "average_response_time": self._total_response_time / total_requests
         }
     
     async def close(self):
         """Ferme proprement la session HTTP."""
-        if self._session and not self._session.closed:
-            await self._session.close()
-            logger.debug("Session HTTP fermée")
+        self._session_ready = False
+        if self._session and not self._session.is_closed:
+            await self._session.aclose()
+            logger.debug("Client HTTP fermé")
     
     async def __aenter__(self):
         """Support du context manager."""
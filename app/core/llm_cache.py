@@ -0,0 +1,202 @@
+"""
+Cache des réponses LLM.
+
+Évite un aller-retour vers le fournisseur LLM lorsque la même conversation
+est soumise à nouveau avec des paramètres déterministes (température basse).
+Deux niveaux : LRU en mémoire, puis Redis (partagé entre workers et conservé
+après un redémarrage).
+
+Author: Datasulting
+Version: 2.0.0
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from app.core.exceptions import CacheError
+from app.utils.cache import cache_get, cache_invalidate, cache_set
+
+logger = logging.getLogger(__name__)
+
+# Au-delà de cette température les réponses ne sont pas reproductibles :
+# elles ne sont pas mises en cache
+MAX_CACHEABLE_TEMPERATURE = 0.2
+
+# Préfixe des clés Redis des réponses LLM
+_REDIS_KEY_PREFIX = "llm:"
+
+
+class LLMResponseCache:
+    """
+    Cache LRU en mémoire, avec expiration, des réponses LLM.
+    
+    Les clés sont une empreinte blake2b du fournisseur, du modèle, des
+    messages et des paramètres de génération.
+    """
+    
+    def __init__(self, max_size: int = 1024, ttl: int = 3600):
+        """
+        Initialise le cache.
+        
+        Args:
+            max_size: Nombre maximum d'entrées (0 = cache désactivé)
+            ttl: Durée de vie d'une entrée en secondes
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._redis_hits = 0
+    
+    @property
+    def enabled(self) -> bool:
+        """Indique si le cache est actif."""
+        return self.max_size > 0
+    
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: Optional[str],
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any]
+    ) -> str:
+        """
+        Calcule la clé de cache d'une requête LLM.
+        
+        Args:
+            provider: Nom du fournisseur
+            model: Modèle demandé (None = modèle par défaut)
+            messages: Messages de la conversation
+            params: Paramètres de génération (temperature, max_tokens, etc.)
+        
+        Returns:
+            Empreinte hexadécimale de la requête
+        """
+        raw = orjson.dumps([provider, model, messages, params], option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Récupère une réponse si elle est présente et non expirée.
+        
+        Args:
+            key: Clé calculée par make_key
+        
+        Returns:
+            Réponse en cache ou None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        
+        response, created_at = entry
+        if time.monotonic() - created_at > self.ttl:
+            del self._entries[key]
+            self._misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return response
+    
+    def set(self, key: str, response: str):
+        """
+        Stocke une réponse en évinçant l'entrée la plus ancienne si besoin.
+        
+        Args:
+            key: Clé calculée par make_key
+            response: Réponse du modèle
+        """
+        if not self.enabled:
+            return
+        
+        self._entries[key] = (response, time.monotonic())
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    async def fetch(self, key: str) -> Optional[str]:
+        """
+        Récupère une réponse en mémoire puis, à défaut, dans Redis.
+        
+        Args:
+            key: Clé calculée par make_key
+        
+        Returns:
+            Réponse en cache ou None
+        """
+        response = self.get(key)
+        if response is not None:
+            return response
+        
+        try:
+            entry = await cache_get(_REDIS_KEY_PREFIX + key)
+        except CacheError as e:
+            logger.warning(f"Cache Redis des réponses LLM indisponible: {e}")
+            return None
+        
+        response = entry.get("response") if entry else None
+        if not isinstance(response, str):
+            return None
+        
+        self._redis_hits += 1
+        self.set(key, response)
+        return response
+    
+    async def store(self, key: str, response: str):
+        """
+        Stocke une réponse en mémoire et dans Redis.
+        
+        Args:
+            key: Clé calculée par make_key
+            response: Réponse du modèle
+        """
+        if not self.enabled:
+            return
+        
+        self.set(key, response)
+        try:
+            await cache_set(_REDIS_KEY_PREFIX + key, {"response": response}, ttl=self.ttl)
+        except CacheError as e:
+            logger.warning(f"Échec du stockage de la réponse LLM dans Redis: {e}")
+    
+    async def discard(self, key: str):
+        """
+        Retire une réponse du cache mémoire et de Redis.
+        
+        Args:
+            key: Clé calculée par make_key
+        """
+        if not self.enabled:
+            return
+        
+        self._entries.pop(key, None)
+        await cache_invalidate(_REDIS_KEY_PREFIX + key)
+    
+    def clear(self):
+        """Vide le cache mémoire (les entrées Redis expirent d'elles-mêmes)."""
+        self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne les statistiques du cache.
+        
+        Returns:
+            Dictionnaire avec taille, hits, misses et taux de succès
+        """
+        total = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "redis_hits": self._redis_hits,
+            "hit_rate": round(self._hits / total * 100, 2) if total else 0
+        }
@@ -8,16 +8,54 @@ Author: Datasulting
 Version: 2.0.0 - CORRIGÉ avec support du contexte
 """
 
+import functools
 import logging
-from typing import Dict, Any, List, Optional, Union
+import re
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, Any, List, Optional, Union
 import asyncio
 
 from .llm_providers import BaseLLMProvider, OpenAIProvider, AnthropicProvider, GoogleProvider
 from .http_client import HTTPClient
-from .exceptions import LLMError, LLMConfigError
+from .llm_cache import LLMResponseCache, MAX_CACHEABLE_TEMPERATURE
+from .circuit_breaker import CircuitBreaker
+from .rate_limiter import RateLimiter, estimate_tokens
+from .exceptions import LLMError, LLMConfigError, LLMNetworkError, LLMQuotaError
 
 logger = logging.getLogger(__name__)
 
+# Bloc de code markdown (```sql ... ```) autour d'une requête générée, espaces
+# de bord compris (un seul passage sur la réponse)
+_SQL_FENCE_RE = re.compile(r"^\s*```(?:sql)?\s*(.*?)\s*(?:```)?\s*$", re.DOTALL | re.IGNORECASE)
+
+# Verdict d'une réponse de classification (pertinence, validation sémantique)
+_VERDICT_RE = re.compile(r"\b(HORS[_\s]?SUJET|OUI|NON)\b", re.IGNORECASE)
+
+# Messages système statiques, construits une seule fois et partagés entre les
+# appels (à ne pas modifier) : octet pour octet identiques d'une requête à
+# l'autre, ils profitent aussi du cache de préfixe des fournisseurs
+_VALIDATION_SYSTEM_CONTENT = "Tu es un expert SQL qui valide la correspondance entre une demande et une requête SQL générée."
+_EXPLANATION_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "Tu es un expert SQL qui explique des requêtes SQL de manière simple et accessible."
+}
+_RELEVANCE_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "Tu détermines si une question concerne les ressources humaines."
+}
+
+
+@functools.lru_cache(maxsize=16)
+def _system_message(content: str) -> Dict[str, str]:
+    """
+    Message système partagé pour un contenu donné (à ne pas modifier).
+    
+    Les contenus avec schéma sont eux-mêmes mémorisés par
+    _with_schema_prefix : le même objet message est réutilisé d'un appel à
+    l'autre au lieu d'un nouveau dictionnaire par requête.
+    """
+    return {"role": "system", "content": content}
+
 
 class LLMFactory:
     """
@@ -32,12 +70,38 @@ class LLMFactory:
     - Prompts modulaires via Jinja2
     """
     
-    # Mapping des providers disponibles
-    _PROVIDER_CLASSES = {
+    # Mapping des providers disponibles (en lecture seule)
+    _PROVIDER_CLASSES = MappingProxyType({
         "openai": OpenAIProvider,
         "anthropic": AnthropicProvider,
         "google": GoogleProvider
-    }
+    })
+    _AVAILABLE_PROVIDERS = tuple(_PROVIDER_CLASSES)
+    
+    # Limites de débit par provider (requêtes/min, tokens/min), appliquées
+    # côté client si LLM_RATE_LIMIT_ENABLED
+    _RATE_LIMIT_PROFILES = MappingProxyType({
+        "openai": (60, 150_000),
+        "anthropic": (50, 80_000),
+        "google": (60, 100_000)
+    })
+    
+    # Délai maximal d'un health check (secondes), pour qu'un provider
+    # bloqué ne retarde pas tout le rapport de santé
+    _HEALTH_CHECK_TIMEOUT = 10.0
+    
+    # Tokens générés pour une réponse de classification (OUI, NON, HORS_SUJET) :
+    # le décodage s'arrête peu après le verdict au lieu de laisser le modèle
+    # développer, avec assez de marge pour une courte phrase d'introduction
+    _VERDICT_MAX_TOKENS = 64
+    
+    # Suspension d'un provider après un 429 sans Retry-After (secondes)
+    _RATE_LIMIT_BLOCK = 5.0
+    
+    # Exemples similaires inclus dans un prompt de génération SQL (les mieux
+    # classés par la recherche vectorielle) : au-delà, ils alourdissent la
+    # requête sans améliorer la génération
+    _MAX_SQL_EXAMPLES = 3
     
     def __init__(self, config):
         """
@@ -47,27 +111,123 @@ class LLMFactory:
             config: Configuration de l'application contenant les clés API
         """
         self.config = config
-        self.http_client = HTTPClient()
+        
+        # Valeurs lues à chaque requête, figées à la construction : une
+        # reconfiguration nécessite de recréer la factory
+        self._default_provider: str = config.DEFAULT_PROVIDER
+        self._default_temperature: float = config.LLM_TEMPERATURE
+        self._fallback_provider: Optional[str] = config.FALLBACK_PROVIDER
+        
+        # Client HTTP/2 unique partagé par tous les providers (un pool de
+        # connexions par hôte), fermé par close()
+        self.http_client = HTTPClient(
+            max_keepalive_connections=max(config.LLM_CONCURRENCY, 30)
+        )
         self._provider_instances: Dict[str, BaseLLMProvider] = {}
-        self._initialization_lock = asyncio.Lock()
+        
+        # Providers dont la création a échoué (configuration absente ou invalide) :
+        # l'erreur est relancée sans retenter la construction à chaque appel
+        self._provider_errors: Dict[str, LLMConfigError] = {}
+        
+        # Modèles des providers configurés (statiques, calculés au premier appel)
+        self._available_models: Optional[List[Dict[str, str]]] = None
+        
+        # Cache des réponses déterministes (évite un aller-retour réseau)
+        self.response_cache = LLMResponseCache(config.LLM_CACHE_SIZE, config.LLM_CACHE_TTL)
+        
+        # Completions en cours par clé de cache (mutualisation des doublons
+        # simultanés) : [tâche de l'appel, nombre d'appelants en attente]
+        self._inflight: Dict[str, List[Any]] = {}
+        
+        # Disjoncteurs par provider (créés à la première utilisation)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        
+        # Limiteurs de débit par provider (créés à la première utilisation)
+        self._rate_limit_enabled: bool = config.LLM_RATE_LIMIT_ENABLED
+        self._limiters: Dict[str, RateLimiter] = {}
+        
+        # Appels simultanés maximum par provider (0 = illimité), sémaphores
+        # créés à la première utilisation
+        self._max_concurrent: int = config.LLM_MAX_CONCURRENT_PER_PROVIDER
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
         
         # Gestionnaire de prompts Jinja2 (lazy loading pour éviter dépendances circulaires)
         self._prompt_manager = None
+        self._prompt_manager_loaded = False
         
         logger.info(f"LLMFactory initialisée avec provider par défaut: {config.DEFAULT_PROVIDER}")
     
     @property
     def prompt_manager(self):
         """Propriété pour lazy loading du PromptManager."""
-        if self._prompt_manager is None:
+        # Une seule tentative de chargement : un import en échec n'est pas
+        # retenté (et re-journalisé) à chaque requête
+        if not self._prompt_manager_loaded:
             try:
                 from app.prompts.prompt_manager import get_prompt_manager
                 self._prompt_manager = get_prompt_manager()
             except ImportError as e:
                 logger.warning(f"PromptManager non disponible, utilisation des prompts par défaut: {e}")
                 self._prompt_manager = None
+            self._prompt_manager_loaded = True
         return self._prompt_manager
     
+    def _get_breaker(self, provider_name: str) -> CircuitBreaker:
+        """
+        Récupère ou crée le disjoncteur d'un provider.
+        
+        Args:
+            provider_name: Nom du provider
+            
+        Returns:
+            Disjoncteur associé au provider
+        """
+        breaker = self._breakers.get(provider_name)
+        if breaker is None:
+            breaker = self._breakers[provider_name] = CircuitBreaker(
+                provider_name,
+                failure_threshold=self.config.CIRCUIT_BREAKER_THRESHOLD,
+                reset_timeout=self.config.CIRCUIT_BREAKER_RESET_TIMEOUT
+            )
+        return breaker
+    
+    def _get_limiter(self, provider_name: str) -> Optional[RateLimiter]:
+        """
+        Récupère ou crée le limiteur de débit d'un provider.
+        
+        Args:
+            provider_name: Nom du provider
+            
+        Returns:
+            Limiteur associé au provider, None si la limitation est désactivée
+        """
+        if not self._rate_limit_enabled:
+            return None
+        
+        limiter = self._limiters.get(provider_name)
+        if limiter is None:
+            rpm, tpm = self._RATE_LIMIT_PROFILES.get(provider_name, (0, 0))
+            limiter = self._limiters[provider_name] = RateLimiter(provider_name, rpm, tpm)
+        return limiter
+    
+    def _get_semaphore(self, provider_name: str) -> Optional[asyncio.Semaphore]:
+        """
+        Récupère ou crée le sémaphore de concurrence d'un provider.
+        
+        Args:
+            provider_name: Nom du provider
+            
+        Returns:
+            Sémaphore associé au provider, None si la concurrence n'est pas bornée
+        """
+        if self._max_concurrent <= 0:
+            return None
+        
+        semaphore = self._semaphores.get(provider_name)
+        if semaphore is None:
+            semaphore = self._semaphores[provider_name] = asyncio.Semaphore(self._max_concurrent)
+        return semaphore
+    
     async def get_provider(self, provider_name: str) -> BaseLLMProvider:
         """
         Récupère ou crée une instance de provider LLM.
@@ -81,30 +241,80 @@ class LLMFactory:
         Raises:
             LLMConfigError: Si le provider n'est pas supporté ou mal configuré
         """
-        if provider_name not in self._PROVIDER_CLASSES:
-            available_providers = list(self._PROVIDER_CLASSES.keys())
+        # Chemin rapide : instance déjà en cache (nom forcément valide)
+        instance = self._provider_instances.get(provider_name)
+        if instance is not None:
+            return instance
+        
+        error = self._provider_errors.get(provider_name)
+        if error is not None:
+            raise error
+        
+        provider_class = self._PROVIDER_CLASSES.get(provider_name)
+        if provider_class is None:
             raise LLMConfigError(
                 provider_name, 
-                f"Provider non supporté. Providers disponibles: {available_providers}"
+                f"Provider non supporté. Providers disponibles: {list(self._AVAILABLE_PROVIDERS)}"
             )
         
-        # Vérification thread-safe de l'instance en cache
-        if provider_name not in self._provider_instances:
-            async with self._initialization_lock:
-                # Double-check pattern pour éviter la création multiple
-                if provider_name not in self._provider_instances:
-                    try:
-                        provider_class = self._PROVIDER_CLASSES[provider_name]
-                        instance = provider_class(self.config, self.http_client)
-                        self._provider_instances[provider_name] = instance
-                        
-                        logger.debug(f"Provider {provider_name} créé et mis en cache")
-                    
-                    except Exception as e:
-                        logger.error(f"Erreur lors de la création du provider {provider_name}: {e}")
-                        raise LLMConfigError(provider_name, f"Impossible de créer le provider: {e}")
-        
-        return self._provider_instances[provider_name]
+        return self._create_provider(provider_name, provider_class)
+    
+    def _create_provider(self, provider_name: str, provider_class) -> BaseLLMProvider:
+        """
+        Crée et met en cache une instance de provider.
+        
+        La construction est synchrone (aucun await) : pas de verrou nécessaire,
+        setdefault conserve la première instance publiée. Un échec est mémorisé
+        pour que les appels suivants échouent sans retenter la construction.
+        
+        Args:
+            provider_name: Nom du provider
+            provider_class: Classe du provider
+            
+        Returns:
+            Instance du provider
+            
+        Raises:
+            LLMConfigError: Si le provider est mal configuré
+        """
+        try:
+            instance = provider_class(self.config, self.http_client)
+        except Exception as e:
+            logger.error(f"Erreur lors de la création du provider {provider_name}: {e}")
+            error = LLMConfigError(provider_name, f"Impossible de créer le provider: {e}")
+            self._provider_errors[provider_name] = error
+            raise error
+        
+        logger.debug(f"Provider {provider_name} créé et mis en cache")
+        return self._provider_instances.setdefault(provider_name, instance)
+    
+    def warmup(self) -> List[str]:
+        """
+        Crée d'avance les instances de tous les providers.
+        
+        Appelé au démarrage pour sortir la construction des providers du
+        chemin de la première requête. Les providers non configurés sont
+        mémorisés comme indisponibles.
+        
+        Returns:
+            Liste des noms des providers configurés
+        """
+        configured = []
+        
+        for provider_name, provider_class in self._PROVIDER_CLASSES.items():
+            if provider_name in self._provider_instances:
+                configured.append(provider_name)
+                continue
+            if provider_name in self._provider_errors:
+                continue
+            
+            try:
+                self._create_provider(provider_name, provider_class)
+                configured.append(provider_name)
+            except LLMConfigError:
+                continue
+        
+        return configured
     
     async def generate_completion(
         self,
@@ -128,24 +338,200 @@ class LLMFactory:
         Raises:
             LLMError: Si la génération échoue
         """
-        provider_name = provider or self.config.DEFAULT_PROVIDER
+        provider_name = provider or self._default_provider
         
+        # Seules les générations à basse température (reproductibles) sont
+        # mises en cache et mutualisées entre appels identiques simultanés
+        cache_key = None
+        if kwargs.get("temperature", self._default_temperature) <= MAX_CACHEABLE_TEMPERATURE:
+            cache_key = LLMResponseCache.make_key(provider_name, model, messages, kwargs)
+            if self.response_cache.enabled:
+                cached = await self.response_cache.fetch(cache_key)
+                if cached is not None:
+                    logger.debug(f"Completion servie depuis le cache ({provider_name})")
+                    return cached
+            
+            # Requête identique déjà en cours : attendre son résultat plutôt
+            # que de relancer un appel au fournisseur
+            inflight = self._inflight.get(cache_key)
+            if inflight is not None:
+                logger.debug(f"Completion identique en cours, attente du résultat ({provider_name})")
+                return await self._await_inflight(cache_key, inflight)
+        
+        # Provider en panne : échec immédiat ou bascule vers le provider de secours
+        breaker = self._get_breaker(provider_name)
+        if not breaker.allow_request():
+            fallback = self._fallback_provider
+            if fallback and fallback != provider_name:
+                logger.warning(f"Circuit {provider_name} ouvert, bascule vers {fallback}")
+                return await self.generate_completion(messages, provider=fallback, **kwargs)
+            raise LLMNetworkError(provider_name, "Fournisseur temporairement indisponible (circuit ouvert)")
+        
+        if cache_key is None:
+            return await self._call_provider(provider_name, breaker, messages, model, None, kwargs)
+        
+        # Appel exécuté dans sa propre tâche, partagée avec les appels
+        # identiques : l'annulation d'un appelant n'interrompt pas les autres
+        task = asyncio.ensure_future(
+            self._call_provider(provider_name, breaker, messages, model, cache_key, kwargs)
+        )
+        inflight = self._inflight[cache_key] = [task, 0]
+        task.add_done_callback(functools.partial(self._forget_inflight, cache_key, inflight))
+        return await self._await_inflight(cache_key, inflight)
+    
+    async def _await_inflight(self, cache_key: str, inflight: List[Any]) -> str:
+        """
+        Attend le résultat d'une completion partagée.
+        
+        L'appel au fournisseur n'est annulé que lorsque plus aucun appelant
+        n'attend son résultat.
+        
+        Args:
+            cache_key: Clé de cache de la completion
+            inflight: Entrée [tâche, nombre d'appelants en attente] de _inflight
+            
+        Returns:
+            Texte généré par le modèle
+        """
+        task = inflight[0]
+        inflight[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            inflight[1] -= 1
+            if inflight[1] == 0 and not task.done():
+                # Dernier appelant annulé : libérer la clé tout de suite pour
+                # qu'un nouvel appel ne rejoigne pas une tâche en cours d'annulation
+                self._forget_inflight(cache_key, inflight)
+                task.cancel()
+    
+    def _forget_inflight(self, cache_key: str, inflight: List[Any], task: Optional[asyncio.Task] = None):
+        """Retire une completion partagée de _inflight si elle y est encore."""
+        if self._inflight.get(cache_key) is inflight:
+            del self._inflight[cache_key]
+    
+    async def _call_provider(
+        self,
+        provider_name: str,
+        breaker: CircuitBreaker,
+        messages: List[Dict[str, str]],
+        model: Optional[str],
+        cache_key: Optional[str],
+        kwargs: Dict[str, Any]
+    ) -> str:
+        """
+        Appelle le provider et met la réponse en cache.
+        
+        Args:
+            provider_name: Nom du provider
+            breaker: Disjoncteur du provider
+            messages: Liste des messages de conversation
+            model: Modèle spécifique (défaut du provider si None)
+            cache_key: Clé de cache de la réponse (None = pas de mise en cache)
+            kwargs: Paramètres de génération
+            
+        Returns:
+            Texte généré par le modèle
+        """
+        limiter = self._get_limiter(provider_name)
         try:
             llm_provider = await self.get_provider(provider_name)
             
+            # Attendre une place dans la fenêtre de débit du provider plutôt
+            # que d'essuyer un 429
+            if limiter is not None:
+                await limiter.acquire(estimate_tokens(messages, kwargs.get("max_tokens") or 0))
+            
             logger.debug(
                 f"Génération completion avec {provider_name}, "
                 f"modèle: {model or 'défaut'}, "
                 f"messages: {len(messages)}"
             )
             
-            result = await llm_provider.generate_completion(messages, model, **kwargs)
+            semaphore = self._get_semaphore(provider_name)
+            if semaphore is None:
+                result = await llm_provider.generate_completion(messages, model, **kwargs)
+            else:
+                async with semaphore:
+                    result = await llm_provider.generate_completion(messages, model, **kwargs)
+            breaker.record_success()
+            
+            if cache_key is not None:
+                await self.response_cache.store(cache_key, result)
             
             logger.info(f"Completion générée avec succès par {provider_name}")
             return result
         
         except Exception as e:
             logger.error(f"Erreur lors de la génération avec {provider_name}: {e}")
+            # Seules les pannes du fournisseur (réseau, 5xx, 429) ouvrent le circuit
+            if (isinstance(e, LLMError) and not isinstance(e, LLMConfigError)
+                    and (e.status_code == 429 or e.status_code >= 500)):
+                breaker.record_failure()
+            if limiter is not None and isinstance(e, LLMQuotaError):
+                limiter.block(e.details.get("retry_after") or self._RATE_LIMIT_BLOCK)
+            raise
+    
+    async def generate_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Génère une completion en transmettant le texte au fil de l'eau.
+        
+        Le premier fragment arrive dès le premier token décodé au lieu
+        d'attendre la réponse complète. Pas de cache ni de mutualisation :
+        utiliser generate_completion pour les réponses réutilisables.
+        
+        Args:
+            messages: Liste des messages de conversation
+            provider: Nom du provider (utilise le défaut si None)
+            model: Modèle spécifique (utilise le défaut du provider si None)
+            **kwargs: Paramètres supplémentaires (temperature, max_tokens, etc.)
+            
+        Yields:
+            Fragments de texte générés
+            
+        Raises:
+            LLMError: Si la génération échoue
+        """
+        provider_name = provider or self._default_provider
+        
+        breaker = self._get_breaker(provider_name)
+        if not breaker.allow_request():
+            fallback = self._fallback_provider
+            if fallback and fallback != provider_name:
+                logger.warning(f"Circuit {provider_name} ouvert, bascule vers {fallback}")
+                async for chunk in self.generate_completion_stream(messages, provider=fallback, **kwargs):
+                    yield chunk
+                return
+            raise LLMNetworkError(provider_name, "Fournisseur temporairement indisponible (circuit ouvert)")
+        
+        llm_provider = await self.get_provider(provider_name)
+        limiter = self._get_limiter(provider_name)
+        if limiter is not None:
+            await limiter.acquire(estimate_tokens(messages, kwargs.get("max_tokens") or 0))
+        
+        semaphore = self._get_semaphore(provider_name)
+        try:
+            if semaphore is None:
+                async for chunk in llm_provider.stream_completion(messages, model, **kwargs):
+                    yield chunk
+            else:
+                # Place conservée jusqu'à la fin du flux
+                async with semaphore:
+                    async for chunk in llm_provider.stream_completion(messages, model, **kwargs):
+                        yield chunk
+            breaker.record_success()
+        except LLMError as e:
+            logger.error(f"Erreur lors du streaming avec {provider_name}: {e}")
+            if e.status_code == 429 or e.status_code >= 500:
+                breaker.record_failure()
+            if limiter is not None and isinstance(e, LLMQuotaError):
+                limiter.block(e.details.get("retry_after") or self._RATE_LIMIT_BLOCK)
             raise
     
     async def generate_sql(
@@ -174,33 +560,37 @@ class LLMFactory:
         Returns:
             Requête SQL générée
         """
+        # Seuls les premiers exemples (triés par score) sont transmis au modèle
+        similar_queries = tuple(similar_queries[:self._MAX_SQL_EXAMPLES]) if similar_queries else ()
+        
         try:
             # Tentative d'utilisation du PromptManager
-            if self.prompt_manager:
+            prompt_manager = self.prompt_manager
+            if prompt_manager:
                 try:
-                    system_content = self.prompt_manager.get_system_message()
-                    user_content = self.prompt_manager.get_sql_generation_prompt(
+                    # Schéma placé dans le message système : préfixe stable mis en cache par le fournisseur
+                    system_content = self._with_schema_prefix(
+                        prompt_manager.get_system_message(), schema
+                    )
+                    user_content = prompt_manager.get_sql_generation_prompt(
                         user_query=user_query,
-                        schema=schema,
-                        similar_queries=similar_queries or [],
+                        schema="",
+                        similar_queries=similar_queries,
                         context=context or {}  # NOUVEAU PARAMÈTRE UTILISÉ
                     )
                 except Exception as e:
                     logger.warning(f"Erreur PromptManager, utilisation prompts par défaut: {e}")
                     system_content, user_content = self._build_fallback_sql_prompt(
-                        user_query, schema, similar_queries or []
+                        user_query, schema, similar_queries
                     )
             else:
                 # Fallback vers les prompts par défaut
                 system_content, user_content = self._build_fallback_sql_prompt(
-                    user_query, schema, similar_queries or []
+                    user_query, schema, similar_queries
                 )
             
             messages = [
-                {
-                    "role": "system",
-                    "content": system_content
-                },
+                _system_message(system_content),
                 {
                     "role": "user",
                     "content": user_content
@@ -249,16 +639,21 @@ class LLMFactory:
         Returns:
             Tuple (is_valid, message)
         """
+        system_content = _VALIDATION_SYSTEM_CONTENT
+        
         try:
             # Tentative d'utilisation du PromptManager
-            if self.prompt_manager:
+            prompt_manager = self.prompt_manager
+            if prompt_manager:
                 try:
-                    prompt_content = self.prompt_manager.get_semantic_validation_prompt(
+                    prompt_content = prompt_manager.get_semantic_validation_prompt(
                         sql_query=sql_query,
                         original_request=original_request,
-                        schema=schema,
+                        schema="",
                         context=context or {}  # NOUVEAU PARAMÈTRE UTILISÉ
                     )
+                    # Schéma placé dans le message système : préfixe stable mis en cache par le fournisseur
+                    system_content = self._with_schema_prefix(system_content, schema)
                 except Exception as e:
                     logger.warning(f"Erreur PromptManager validation, utilisation prompt par défaut: {e}")
                     prompt_content = self._build_fallback_validation_prompt(
@@ -271,10 +666,7 @@ class LLMFactory:
                 )
             
             messages = [
-                {
-                    "role": "system",
-                    "content": "Tu es un expert SQL qui valide la correspondance entre une demande et une requête SQL générée."
-                },
+                _system_message(system_content),
                 {
                     "role": "user",
                     "content": prompt_content
@@ -285,18 +677,23 @@ class LLMFactory:
                 messages=messages,
                 provider=provider,
                 model=model,
-                temperature=0.1
+                temperature=0.1,
+                max_tokens=self._VERDICT_MAX_TOKENS
             )
             
-            response_upper = response.upper()
-            if "HORS_SUJET" in response_upper:
+            verdict = self._parse_verdict(response)
+            if verdict == "HORS_SUJET":
                 return False, "Cette demande ne concerne pas une requête SQL sur cette base de données."
-            elif "OUI" in response_upper:
+            elif verdict == "OUI":
                 return True, "La requête SQL correspond bien à votre demande et est compatible avec le schéma."
-            elif "NON" in response_upper:
+            elif verdict == "NON":
                 return False, "La requête SQL pourrait ne pas correspondre parfaitement à votre demande."
             else:
-                # Par défaut, considérer comme valide en cas d'ambiguïté
+                # Par défaut, considérer comme valide en cas d'ambiguïté, sans
+                # conserver en cache une réponse sans verdict
+                await self._discard_completion(
+                    messages, provider, model, temperature=0.1, max_tokens=self._VERDICT_MAX_TOKENS
+                )
                 return True, "La requête SQL semble correspondre à votre demande."
         
         except Exception as e:
@@ -327,9 +724,10 @@ class LLMFactory:
         """
         try:
             # Tentative d'utilisation du PromptManager
-            if self.prompt_manager:
+            prompt_manager = self.prompt_manager
+            if prompt_manager:
                 try:
-                    prompt_content = self.prompt_manager.get_explanation_prompt(
+                    prompt_content = prompt_manager.get_explanation_prompt(
                         sql_query=sql_query,
                         original_request=original_request,
                         context=context or {}  # NOUVEAU PARAMÈTRE UTILISÉ
@@ -346,10 +744,7 @@ class LLMFactory:
                 )
             
             messages = [
-                {
-                    "role": "system",
-                    "content": "Tu es un expert SQL qui explique des requêtes SQL de manière simple et accessible."
-                },
+                _EXPLANATION_SYSTEM_MESSAGE,
                 {
                     "role": "user",
                     "content": prompt_content
@@ -386,9 +781,10 @@ class LLMFactory:
         """
         try:
             # Tentative d'utilisation du PromptManager
-            if self.prompt_manager:
+            prompt_manager = self.prompt_manager
+            if prompt_manager:
                 try:
-                    prompt_content = self.prompt_manager.get_relevance_check_prompt(user_query)
+                    prompt_content = prompt_manager.get_relevance_check_prompt(user_query)
                 except Exception as e:
                     logger.warning(f"Erreur PromptManager pertinence, utilisation prompt par défaut: {e}")
                     prompt_content = self._build_fallback_relevance_prompt(user_query)
@@ -397,10 +793,7 @@ class LLMFactory:
                 prompt_content = self._build_fallback_relevance_prompt(user_query)
             
             messages = [
-                {
-                    "role": "system",
-                    "content": "Tu détermines si une question concerne les ressources humaines."
-                },
+                _RELEVANCE_SYSTEM_MESSAGE,
                 {
                     "role": "user",
                     "content": prompt_content
@@ -411,9 +804,19 @@ class LLMFactory:
                 messages=messages,
                 provider=provider,
                 model=model,
-                temperature=0.1
+                temperature=0.1,
+                max_tokens=self._VERDICT_MAX_TOKENS
             )
-            return "OUI" in response.upper()
+            verdict = self._parse_verdict(response)
+            if verdict is None:
+                # Réponse sans verdict : pertinente par défaut, et non conservée
+                # en cache pour que la question soit réévaluée
+                logger.warning(f"Verdict de pertinence introuvable dans la réponse: {response[:100]!r}")
+                await self._discard_completion(
+                    messages, provider, model, temperature=0.1, max_tokens=self._VERDICT_MAX_TOKENS
+                )
+                return True
+            return verdict == "OUI"
         except Exception as e:
             logger.error(f"Erreur lors de la vérification de pertinence: {e}")
             return True  # Par défaut, considérer comme pertinent
@@ -451,20 +854,22 @@ Tu dois ABSOLUMENT respecter ces règles:
 
 SQL:"""
         
-        # Ajouter les requêtes similaires si disponibles
+        # Ajouter les requêtes similaires si disponibles (une seule concaténation
+        # finale plutôt qu'une copie du prompt complet par exemple)
         if similar_queries:
-            prompt += "\n\nExemples de requêtes similaires:\n"
-            for i, query in enumerate(similar_queries[:3], 1):
+            parts = [prompt, "\n\nExemples de requêtes similaires:\n"]
+            for i, query in enumerate(similar_queries, 1):
                 metadata = query.get('metadata', {})
                 query_text = metadata.get('texte_complet', 'N/A')
                 sql_query = metadata.get('requete', 'N/A')
                 score = query.get('score', 0)
                 
-                prompt += f"""
+                parts.append(f"""
 Exemple {i} (Score: {score:.2f}):
 Question: "{query_text}"
 SQL: {sql_query}
-"""
+""")
+            prompt = "".join(parts)
         
         return system_message, prompt
     
@@ -530,6 +935,38 @@ Cette question concerne-t-elle les ressources humaines ?
 Réponds UNIQUEMENT par "OUI" ou "NON".
 """
     
+    async def _check_provider_health(self, provider_name: str) -> Dict[str, Any]:
+        """
+        Vérifie l'état d'un provider avec un délai maximal.
+        
+        Args:
+            provider_name: Nom du provider
+            
+        Returns:
+            Dictionnaire avec l'état du provider
+        """
+        try:
+            provider = await self.get_provider(provider_name)
+            return await asyncio.wait_for(provider.health_check(), timeout=self._HEALTH_CHECK_TIMEOUT)
+        except LLMConfigError as e:
+            return {
+                "status": "not_configured",
+                "provider": provider_name,
+                "error": e.message
+            }
+        except asyncio.TimeoutError:
+            return {
+                "status": "error",
+                "provider": provider_name,
+                "error": f"Health check sans réponse après {self._HEALTH_CHECK_TIMEOUT}s"
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "provider": provider_name,
+                "error": str(e)
+            }
+    
     async def health_check_all(self) -> Dict[str, Any]:
         """
         Vérifie l'état de santé de tous les providers LLM configurés.
@@ -537,30 +974,18 @@ Réponds UNIQUEMENT par "OUI" ou "NON".
         Returns:
             Dictionnaire avec l'état de chaque provider
         """
-        results = {}
-        
-        # Tester chaque provider disponible
-        for provider_name in self._PROVIDER_CLASSES:
-            try:
-                provider = await self.get_provider(provider_name)
-                results[provider_name] = await provider.health_check()
-            except LLMConfigError as e:
-                results[provider_name] = {
-                    "status": "not_configured",
-                    "provider": provider_name,
-                    "error": e.message
-                }
-            except Exception as e:
-                results[provider_name] = {
-                    "status": "error",
-                    "provider": provider_name,
-                    "error": str(e)
-                }
+        # Tester tous les providers en parallèle : la durée totale est celle
+        # du plus lent et non la somme des appels
+        provider_names = self._AVAILABLE_PROVIDERS
+        statuses = await asyncio.gather(
+            *(self._check_provider_health(name) for name in provider_names)
+        )
+        results = dict(zip(provider_names, statuses))
         
         # Déterminer le statut global
-        default_provider = self.config.DEFAULT_PROVIDER
-        default_status = results.get(default_provider, {}).get("status", "error")
-        global_status = "ok" if default_status == "ok" else "error"
+        default_provider = self._default_provider
+        default_info = results.get(default_provider)
+        global_status = "ok" if default_info is not None and default_info.get("status") == "ok" else "error"
         
         # Informations sur le système de prompts
         prompt_status = "ok" if self.prompt_manager else "fallback"
@@ -583,6 +1008,11 @@ Réponds UNIQUEMENT par "OUI" ou "NON".
         Returns:
             Liste des modèles disponibles pour tous les providers configurés
         """
+        # Les modèles et la configuration des providers ne changent pas
+        # pendant la vie de la factory : la liste est construite une fois
+        if self._available_models is not None:
+            return list(self._available_models)
+        
         all_models = []
         
         for provider_name in self._PROVIDER_CLASSES:
@@ -597,7 +1027,8 @@ Réponds UNIQUEMENT par "OUI" ou "NON".
                 logger.warning(f"Impossible de récupérer les modèles pour {provider_name}: {e}")
                 continue
         
-        return all_models
+        self._available_models = all_models
+        return list(all_models)
     
     def get_configured_providers(self) -> List[str]:
         """
@@ -606,22 +1037,49 @@ Réponds UNIQUEMENT par "OUI" ou "NON".
         Returns:
             Liste des noms des providers configurés
         """
-        configured = []
+        return self.warmup()
+    
+    async def _discard_completion(
+        self,
+        messages: List[Dict[str, str]],
+        provider: Optional[str],
+        model: Optional[str],
+        **kwargs
+    ):
+        """
+        Retire du cache la réponse d'une completion (réponse inexploitable).
         
-        for provider_name in self._PROVIDER_CLASSES:
-            try:
-                # Tentative de création pour vérifier la configuration
-                provider_class = self._PROVIDER_CLASSES[provider_name]
-                provider_class(self.config, self.http_client)
-                configured.append(provider_name)
-            except LLMConfigError:
-                # Provider non configuré
-                continue
-            except Exception:
-                # Autre erreur, considérer comme non configuré
-                continue
+        Args:
+            messages: Messages de la completion
+            provider: Provider demandé (défaut si None)
+            model: Modèle demandé
+            **kwargs: Mêmes paramètres que lors de l'appel à generate_completion
+        """
+        cache_key = LLMResponseCache.make_key(provider or self._default_provider, model, messages, kwargs)
+        await self.response_cache.discard(cache_key)
+    
+    @staticmethod
+    def _parse_verdict(response: str) -> Optional[str]:
+        """
+        Extrait le verdict (OUI, NON, HORS_SUJET) d'une réponse.
         
-        return configured
+        Lorsque plusieurs verdicts apparaissent, HORS_SUJET l'emporte sur
+        OUI, qui l'emporte sur NON, quel que soit leur ordre dans la réponse.
+        
+        Args:
+            response: Réponse brute du LLM
+            
+        Returns:
+            Verdict normalisé en majuscules ou None si aucun n'est trouvé
+        """
+        found = {match.group(1)[0].upper() for match in _VERDICT_RE.finditer(response)}
+        if "H" in found:
+            return "HORS_SUJET"
+        if "O" in found:
+            return "OUI"
+        if "N" in found:
+            return "NON"
+        return None
     
     @staticmethod
     def _clean_sql_response(response: str) -> str:
@@ -634,20 +1092,40 @@ Réponds UNIQUEMENT par "OUI" ou "NON".
         Returns:
             Requête SQL nettoyée
         """
-        if response.startswith("```sql"):
-            response = response.replace("```sql", "", 1)
-            if response.endswith("```"):
-                response = response[:-3]
-        elif response.startswith("```"):
-            response = response.replace("```", "", 1)
-            if response.endswith("```"):
-                response = response[:-3]
+        # Les providers renvoient déjà un texte sans espaces de bord
+        match = _SQL_FENCE_RE.match(response)
+        return match.group(1) if match else response
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _with_schema_prefix(system_content: str, schema: str) -> str:
+        """
+        Ajoute le schéma de la base au message système.
+        
+        Le message système et le schéma sont identiques d'un appel à l'autre :
+        placés en tête de conversation, ils forment un préfixe que les
+        fournisseurs mettent en cache (cache automatique OpenAI, cache_control
+        Anthropic), seule la partie variable étant facturée au plein tarif.
+        Le résultat est mémorisé : le long message n'est construit qu'une
+        fois par schéma.
         
-        return response.strip()
+        Args:
+            system_content: Message système
+            schema: Schéma de la base de données
+            
+        Returns:
+            Message système suivi de la documentation du schéma
+        """
+        return (
+            f"{system_content}\n\n"
+            f"# DOCUMENTATION COMPLÈTE DE LA BASE DE DONNÉES\n"
+            f"```\n{schema}\n```"
+        )
     
     async def close(self):
         """Ferme proprement toutes les ressources."""
         try:
+            self.response_cache.clear()
             await self.http_client.close()
             logger.info("LLMFactory fermée proprement")
         except Exception as e:
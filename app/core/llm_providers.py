@@ -8,16 +8,48 @@ Author: Datasulting
 Version: 2.0.0
 """
 
+import functools
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Tuple
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 import asyncio
 
 from .http_client import HTTPClient
+from .rate_limiter import estimate_tokens
 from .exceptions import LLMConfigError, LLMError
 
 logger = logging.getLogger(__name__)
 
+# Marge de sécurité sous la fenêtre de contexte, l'estimation des tokens
+# étant approximative
+_CONTEXT_MARGIN = 128
+
+# Racine des endpoints de modèles de l'API Gemini
+_GOOGLE_MODELS_URL = "https://generativelanguage.googleapis.com/v1beta/models/"
+
+
+@functools.lru_cache(maxsize=32)
+def _anthropic_system_block(system_message: str) -> List[Dict[str, Any]]:
+    """
+    Bloc système Anthropic marqué comme préfixe réutilisable (à ne pas modifier).
+    
+    Les messages système (schéma compris) reviennent d'une requête à
+    l'autre : le même bloc est partagé au lieu d'être reconstruit.
+    """
+    return [
+        {
+            "type": "text",
+            "text": system_message,
+            "cache_control": {"type": "ephemeral"}
+        }
+    ]
+
+
+@functools.lru_cache(maxsize=32)
+def _gemini_generation_config(temperature: float, max_tokens: int) -> Dict[str, Any]:
+    """Paramètres de génération Gemini partagés par combinaison (à ne pas modifier)."""
+    return {"temperature": temperature, "maxOutputTokens": max_tokens}
+
 
 class BaseLLMProvider(ABC):
     """
@@ -27,6 +59,9 @@ class BaseLLMProvider(ABC):
     pour assurer une interface uniforme.
     """
     
+    # Fenêtre de contexte par modèle (tokens), renseignée par chaque provider
+    _CONTEXT_LENGTHS: Dict[str, int] = {}
+    
     def __init__(self, config, http_client: Optional[HTTPClient] = None):
         """
         Initialise le provider.
@@ -37,6 +72,10 @@ class BaseLLMProvider(ABC):
         """
         self.config = config
         self.http_client = http_client or HTTPClient()
+        
+        # Paramètres lus à chaque requête, figés à la construction
+        self._timeout = config.LLM_TIMEOUT
+        self._default_temperature = config.LLM_TEMPERATURE
         self._validate_config()
     
     @abstractmethod
@@ -79,6 +118,27 @@ class BaseLLMProvider(ABC):
         """
         pass
     
+    async def stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Génère une completion en transmettant le texte au fil de l'eau.
+        
+        Implémentation par défaut : un seul fragment, la réponse complète.
+        
+        Args:
+            messages: Liste des messages de conversation
+            model: Modèle à utiliser
+            **kwargs: Paramètres supplémentaires (temperature, max_tokens, etc.)
+            
+        Yields:
+            Fragments de texte générés
+        """
+        yield await self.generate_completion(messages, model, **kwargs)
+    
     @abstractmethod
     async def health_check(self) -> Dict[str, Any]:
         """
@@ -89,6 +149,61 @@ class BaseLLMProvider(ABC):
         """
         pass
     
+    def _fit_context(
+        self, 
+        messages: List[Dict[str, str]], 
+        model: str, 
+        max_tokens: int
+    ) -> List[Dict[str, str]]:
+        """
+        Vérifie avant envoi que la requête tient dans le contexte du modèle.
+        
+        Les tours les plus anciens sont retirés si nécessaire (le message
+        système et le dernier message sont conservés). Une requête qui reste
+        trop longue échoue sans aller-retour vers l'API.
+        
+        Args:
+            messages: Messages de conversation
+            model: Modèle ciblé
+            max_tokens: Tokens de sortie réservés
+            
+        Returns:
+            Messages, éventuellement allégés des tours les plus anciens
+            
+        Raises:
+            LLMError: Si la requête dépasse le contexte du modèle
+        """
+        context_length = self._CONTEXT_LENGTHS.get(model)
+        if context_length is None:
+            return messages
+        
+        limit = context_length - _CONTEXT_MARGIN
+        estimated = estimate_tokens(messages, max_tokens)
+        if estimated <= limit:
+            return messages
+        
+        trimmed = list(messages)
+        while estimated > limit:
+            index = next(
+                (i for i, message in enumerate(trimmed[:-1]) if message["role"] != "system"),
+                None
+            )
+            if index is None:
+                raise LLMError(
+                    self.get_provider_name(),
+                    f"Requête trop longue pour {model}: ~{estimated} tokens estimés "
+                    f"pour un contexte de {context_length}",
+                    400
+                )
+            trimmed.pop(index)
+            estimated = estimate_tokens(trimmed, max_tokens)
+        
+        logger.warning(
+            f"[{self.get_provider_name()}] {len(messages) - len(trimmed)} message(s) ancien(s) "
+            f"retiré(s) pour tenir dans le contexte de {model}"
+        )
+        return trimmed
+    
     def _build_common_payload(
         self, 
         messages: List[Dict[str, str]], 
@@ -108,7 +223,7 @@ class BaseLLMProvider(ABC):
         """
         payload = {
             "model": model,
-            "temperature": kwargs.get("temperature", self.config.LLM_TEMPERATURE)
+            "temperature": kwargs.get("temperature", self._default_temperature)
         }
         
         if "max_tokens" in kwargs:
@@ -132,11 +247,26 @@ class OpenAIProvider(BaseLLMProvider):
         {"id": "gpt-4", "name": "GPT-4", "context_length": 8192},
         {"id": "gpt-3.5-turbo", "name": "GPT-3.5 Turbo", "context_length": 16385}
     ]
+    _VALID_MODEL_IDS = frozenset(m["id"] for m in AVAILABLE_MODELS)
+    _CONTEXT_LENGTHS = {m["id"]: m["context_length"] for m in AVAILABLE_MODELS}
+    
+    # Vue publique des modèles, construite une seule fois (à ne pas modifier)
+    _MODELS_VIEW = tuple(
+        {"provider": "openai", "id": m["id"], "name": m["name"]}
+        for m in AVAILABLE_MODELS
+    )
     
     def _validate_config(self):
         """Valide la configuration OpenAI."""
-        if not hasattr(self.config, 'OPENAI_API_KEY') or not self.config.OPENAI_API_KEY:
+        self._api_key = getattr(self.config, "OPENAI_API_KEY", None)
+        if not self._api_key:
             raise LLMConfigError("openai", "OPENAI_API_KEY manquante dans la configuration")
+        
+        # En-têtes constants, construits une seule fois (à ne pas modifier)
+        self._headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self._api_key}"
+        }
     
     def get_provider_name(self) -> str:
         return "openai"
@@ -146,23 +276,16 @@ class OpenAIProvider(BaseLLMProvider):
     
     def get_available_models(self) -> List[Dict[str, str]]:
         """Retourne les modèles OpenAI disponibles."""
-        return [
-            {
-                "provider": "openai",
-                "id": model["id"],
-                "name": model["name"]
-            }
-            for model in self.AVAILABLE_MODELS
-        ]
+        return list(self._MODELS_VIEW)
     
-    async def generate_completion(
+    def _build_request(
         self, 
         messages: List[Dict[str, str]], 
-        model: Optional[str] = None,
+        model: Optional[str],
         **kwargs
-    ) -> str:
+    ) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
         """
-        Génère une completion via l'API OpenAI.
+        Construit l'URL, les en-têtes et le payload d'une requête OpenAI.
         
         Args:
             messages: Messages au format OpenAI
@@ -170,36 +293,52 @@ class OpenAIProvider(BaseLLMProvider):
             **kwargs: Paramètres OpenAI (temperature, max_tokens, etc.)
             
         Returns:
-            Texte généré
+            Tuple (url, headers, payload)
         """
         model = model or self.get_default_model()
         
         # Validation du modèle
-        valid_models = [m["id"] for m in self.AVAILABLE_MODELS]
-        if model not in valid_models:
+        if model not in self._VALID_MODEL_IDS:
+            valid_models = [m["id"] for m in self.AVAILABLE_MODELS]
             raise LLMError(
                 "openai", 
                 f"Modèle '{model}' non supporté. Modèles disponibles: {valid_models}"
             )
         
+        messages = self._fit_context(messages, model, kwargs.get("max_tokens") or 0)
+        
         # Construction du payload
         payload = self._build_common_payload(messages, model, **kwargs)
         payload["messages"] = messages
         
-        # Headers OpenAI
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.config.OPENAI_API_KEY}"
-        }
-        
         logger.debug(f"[OpenAI] Requête avec modèle {model}, {len(messages)} messages")
+        return "https://api.openai.com/v1/chat/completions", self._headers, payload
+    
+    async def generate_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        model: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        Génère une completion via l'API OpenAI.
+        
+        Args:
+            messages: Messages au format OpenAI
+            model: Modèle à utiliser
+            **kwargs: Paramètres OpenAI (temperature, max_tokens, etc.)
+            
+        Returns:
+            Texte généré
+        """
+        url, headers, payload = self._build_request(messages, model, **kwargs)
         
         # Appel API
         response = await self.http_client.post_json(
-            url="https://api.openai.com/v1/chat/completions",
+            url=url,
             headers=headers,
             payload=payload,
-            timeout=self.config.LLM_TIMEOUT,
+            timeout=self._timeout,
             provider="openai"
         )
         
@@ -215,17 +354,35 @@ class OpenAIProvider(BaseLLMProvider):
             logger.error(f"[OpenAI] Format de réponse invalide: {e}")
             raise LLMError("openai", f"Format de réponse invalide: {e}")
     
+    async def stream_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Génère une completion OpenAI en streaming (fragments delta.content)."""
+        url, headers, payload = self._build_request(messages, model, **kwargs)
+        payload["stream"] = True
+        
+        async for event in self.http_client.stream_sse(
+            url, headers, payload, timeout=self._timeout, provider="openai"
+        ):
+            choices = event.get("choices")
+            if choices:
+                text = choices[0].get("delta", {}).get("content")
+                if text:
+                    yield text
+    
     async def health_check(self) -> Dict[str, Any]:
         """Vérifie la santé du service OpenAI."""
         try:
-            # Test simple avec le modèle le plus léger
-            test_messages = [{"role": "user", "content": "test"}]
-            
-            await self.generate_completion(
-                test_messages, 
-                model="gpt-3.5-turbo",
-                max_tokens=1,
-                temperature=0
+            # Lecture de la fiche du modèle par défaut : valide la clé et le
+            # modèle sans génération (ni latence de prompt, ni tokens facturés)
+            await self.http_client.get_json(
+                f"https://api.openai.com/v1/models/{self.get_default_model()}",
+                headers=self._headers,
+                timeout=self._timeout,
+                provider="openai"
             )
             
             return {
@@ -258,11 +415,27 @@ class AnthropicProvider(BaseLLMProvider):
         {"id": "claude-3-haiku-20240307", "name": "Claude 3 Haiku", "context_length": 200000},
         {"id": "claude-3-5-sonnet-20241022", "name": "Claude 3.5 Sonnet", "context_length": 200000}
     ]
+    _VALID_MODEL_IDS = frozenset(m["id"] for m in AVAILABLE_MODELS)
+    _CONTEXT_LENGTHS = {m["id"]: m["context_length"] for m in AVAILABLE_MODELS}
+    
+    # Vue publique des modèles, construite une seule fois (à ne pas modifier)
+    _MODELS_VIEW = tuple(
+        {"provider": "anthropic", "id": m["id"], "name": m["name"]}
+        for m in AVAILABLE_MODELS
+    )
     
     def _validate_config(self):
         """Valide la configuration Anthropic."""
-        if not hasattr(self.config, 'ANTHROPIC_API_KEY') or not self.config.ANTHROPIC_API_KEY:
+        self._api_key = getattr(self.config, "ANTHROPIC_API_KEY", None)
+        if not self._api_key:
             raise LLMConfigError("anthropic", "ANTHROPIC_API_KEY manquante dans la configuration")
+        
+        # En-têtes constants, construits une seule fois (à ne pas modifier)
+        self._headers = {
+            "Content-Type": "application/json",
+            "x-api-key": self._api_key,
+            "anthropic-version": "2023-06-01"
+        }
     
     def get_provider_name(self) -> str:
         return "anthropic"
@@ -272,14 +445,7 @@ class AnthropicProvider(BaseLLMProvider):
     
     def get_available_models(self) -> List[Dict[str, str]]:
         """Retourne les modèles Anthropic disponibles."""
-        return [
-            {
-                "provider": "anthropic",
-                "id": model["id"],
-                "name": model["name"]
-            }
-            for model in self.AVAILABLE_MODELS
-        ]
+        return list(self._MODELS_VIEW)
     
     def _convert_messages_to_anthropic_format(
         self, 
@@ -296,30 +462,33 @@ class AnthropicProvider(BaseLLMProvider):
         """
         system_message = ""
         anthropic_messages = []
+        append = anthropic_messages.append
         
         for message in messages:
             role = message["role"]
-            content = message["content"]
             
-            if role == "system":
-                system_message = content
-            elif role == "user":
-                anthropic_messages.append({"role": "user", "content": content})
-            elif role == "assistant":
-                anthropic_messages.append({"role": "assistant", "content": content})
+            if role == "user" or role == "assistant":
+                # Même format chez Anthropic : le message est repris tel quel
+                # lorsqu'il ne porte pas de champ supplémentaire
+                if len(message) == 2:
+                    append(message)
+                else:
+                    append({"role": role, "content": message["content"]})
+            elif role == "system":
+                system_message = message["content"]
             else:
                 logger.warning(f"[Anthropic] Rôle de message inconnu: {role}")
         
         return system_message, anthropic_messages
     
-    async def generate_completion(
+    def _build_request(
         self, 
         messages: List[Dict[str, str]], 
-        model: Optional[str] = None,
+        model: Optional[str],
         **kwargs
-    ) -> str:
+    ) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
         """
-        Génère une completion via l'API Anthropic.
+        Construit l'URL, les en-têtes et le payload d'une requête Anthropic.
         
         Args:
             messages: Messages au format OpenAI (convertis automatiquement)
@@ -327,18 +496,20 @@ class AnthropicProvider(BaseLLMProvider):
             **kwargs: Paramètres Anthropic
             
         Returns:
-            Texte généré par Claude
+            Tuple (url, headers, payload)
         """
         model = model or self.get_default_model()
         
         # Validation du modèle
-        valid_models = [m["id"] for m in self.AVAILABLE_MODELS]
-        if model not in valid_models:
+        if model not in self._VALID_MODEL_IDS:
+            valid_models = [m["id"] for m in self.AVAILABLE_MODELS]
             raise LLMError(
                 "anthropic", 
                 f"Modèle '{model}' non supporté. Modèles disponibles: {valid_models}"
             )
         
+        messages = self._fit_context(messages, model, kwargs.get("max_tokens", 4000))
+        
         # Conversion du format des messages
         system_message, anthropic_messages = self._convert_messages_to_anthropic_format(messages)
         
@@ -346,29 +517,43 @@ class AnthropicProvider(BaseLLMProvider):
         payload = {
             "model": model,
             "messages": anthropic_messages,
-            "temperature": kwargs.get("temperature", self.config.LLM_TEMPERATURE),
+            "temperature": kwargs.get("temperature", self._default_temperature),
             "max_tokens": kwargs.get("max_tokens", 4000)
         }
         
-        # Ajouter le message système si présent
+        # Ajouter le message système si présent, marqué comme préfixe réutilisable
+        # (cache de prompt Anthropic : les lectures en cache coûtent ~10% du tarif)
         if system_message:
-            payload["system"] = system_message
-        
-        # Headers Anthropic
-        headers = {
-            "Content-Type": "application/json",
-            "x-api-key": self.config.ANTHROPIC_API_KEY,
-            "anthropic-version": "2023-06-01"
-        }
+            payload["system"] = _anthropic_system_block(system_message)
         
         logger.debug(f"[Anthropic] Requête avec modèle {model}, {len(anthropic_messages)} messages")
+        return "https://api.anthropic.com/v1/messages", self._headers, payload
+    
+    async def generate_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        model: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        Génère une completion via l'API Anthropic.
+        
+        Args:
+            messages: Messages au format OpenAI (convertis automatiquement)
+            model: Modèle Claude à utiliser
+            **kwargs: Paramètres Anthropic
+            
+        Returns:
+            Texte généré par Claude
+        """
+        url, headers, payload = self._build_request(messages, model, **kwargs)
         
         # Appel API
         response = await self.http_client.post_json(
-            url="https://api.anthropic.com/v1/messages",
+            url=url,
             headers=headers,
             payload=payload,
-            timeout=self.config.LLM_TIMEOUT,
+            timeout=self._timeout,
             provider="anthropic"
         )
         
@@ -384,17 +569,37 @@ class AnthropicProvider(BaseLLMProvider):
             logger.error(f"[Anthropic] Format de réponse invalide: {e}")
             raise LLMError("anthropic", f"Format de réponse invalide: {e}")
     
+    async def stream_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Génère une completion Anthropic en streaming (événements content_block_delta)."""
+        url, headers, payload = self._build_request(messages, model, **kwargs)
+        payload["stream"] = True
+        
+        async for event in self.http_client.stream_sse(
+            url, headers, payload, timeout=self._timeout, provider="anthropic"
+        ):
+            event_type = event.get("type")
+            if event_type == "content_block_delta":
+                text = event.get("delta", {}).get("text")
+                if text:
+                    yield text
+            elif event_type == "error":
+                raise LLMError("anthropic", f"Erreur de streaming: {event.get('error')}")
+    
     async def health_check(self) -> Dict[str, Any]:
         """Vérifie la santé du service Anthropic."""
         try:
-            # Test simple avec Claude Haiku (le plus rapide)
-            test_messages = [{"role": "user", "content": "test"}]
-            
-            await self.generate_completion(
-                test_messages, 
-                model="claude-3-haiku-20240307",
-                max_tokens=1,
-                temperature=0
+            # Lecture de la fiche du modèle par défaut : valide la clé et le
+            # modèle sans génération (ni latence de prompt, ni tokens facturés)
+            await self.http_client.get_json(
+                f"https://api.anthropic.com/v1/models/{self.get_default_model()}",
+                headers=self._headers,
+                timeout=self._timeout,
+                provider="anthropic"
             )
             
             return {
@@ -426,11 +631,36 @@ class GoogleProvider(BaseLLMProvider):
         {"id": "gemini-1.5-pro", "name": "Gemini 1.5 Pro", "context_length": 1000000},
         {"id": "gemini-1.5-flash", "name": "Gemini 1.5 Flash", "context_length": 1000000}
     ]
+    _VALID_MODEL_IDS = frozenset(m["id"] for m in AVAILABLE_MODELS)
+    _CONTEXT_LENGTHS = {m["id"]: m["context_length"] for m in AVAILABLE_MODELS}
+    
+    # Vue publique des modèles, construite une seule fois (à ne pas modifier)
+    _MODELS_VIEW = tuple(
+        {"provider": "google", "id": m["id"], "name": m["name"]}
+        for m in AVAILABLE_MODELS
+    )
     
     def _validate_config(self):
         """Valide la configuration Google."""
-        if not hasattr(self.config, 'GOOGLE_API_KEY') or not self.config.GOOGLE_API_KEY:
+        self._api_key = getattr(self.config, "GOOGLE_API_KEY", None)
+        if not self._api_key:
             raise LLMConfigError("google", "GOOGLE_API_KEY manquante dans la configuration")
+        
+        # En-têtes et URLs constants, construits une seule fois par modèle
+        # supporté (à ne pas modifier) : (génération, streaming SSE).
+        # La clé passe dans l'en-tête pour ne pas apparaître dans les URLs
+        # (logs, traces, messages d'erreur)
+        self._headers = {
+            "Content-Type": "application/json",
+            "x-goog-api-key": self._api_key
+        }
+        self._urls = {
+            model_id: (
+                f"{_GOOGLE_MODELS_URL}{model_id}:generateContent",
+                f"{_GOOGLE_MODELS_URL}{model_id}:streamGenerateContent?alt=sse"
+            )
+            for model_id in self._VALID_MODEL_IDS
+        }
     
     def get_provider_name(self) -> str:
         return "google"
@@ -440,14 +670,7 @@ class GoogleProvider(BaseLLMProvider):
     
     def get_available_models(self) -> List[Dict[str, str]]:
         """Retourne les modèles Google disponibles."""
-        return [
-            {
-                "provider": "google",
-                "id": model["id"],
-                "name": model["name"]
-            }
-            for model in self.AVAILABLE_MODELS
-        ]
+        return list(self._MODELS_VIEW)
     
     def _convert_messages_to_gemini_format(
         self, 
@@ -463,92 +686,104 @@ class GoogleProvider(BaseLLMProvider):
             Messages au format Gemini
         """
         gemini_messages = []
+        append = gemini_messages.append
         system_content = None
         
         for message in messages:
             role = message["role"]
             content = message["content"]
             
-            if role == "system":
-                system_content = content
-            elif role == "user":
+            if role == "user":
                 # Intégrer le message système dans le premier message utilisateur
                 if system_content:
                     content = f"Instructions système: {system_content}\n\nUtilisateur: {content}"
                     system_content = None  # Utiliser une seule fois
                 
-                gemini_messages.append({
-                    "role": "user",
-                    "parts": [{"text": content}]
-                })
+                append({"role": "user", "parts": [{"text": content}]})
             elif role == "assistant":
-                gemini_messages.append({
-                    "role": "model",
-                    "parts": [{"text": content}]
-                })
+                append({"role": "model", "parts": [{"text": content}]})
+            elif role == "system":
+                system_content = content
             else:
                 logger.warning(f"[Google] Rôle de message inconnu: {role}")
         
         return gemini_messages
     
-    async def generate_completion(
+    def _build_request(
         self, 
         messages: List[Dict[str, str]], 
-        model: Optional[str] = None,
+        model: Optional[str],
+        stream: bool = False,
         **kwargs
-    ) -> str:
+    ) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
         """
-        Génère une completion via l'API Google Gemini.
+        Construit l'URL, les en-têtes et le payload d'une requête Gemini.
         
         Args:
             messages: Messages au format OpenAI (convertis automatiquement)
             model: Modèle Gemini à utiliser
+            stream: Utiliser l'endpoint de streaming (SSE)
             **kwargs: Paramètres Gemini
             
         Returns:
-            Texte généré par Gemini
+            Tuple (url, headers, payload)
         """
         model = model or self.get_default_model()
         
         # Validation du modèle
-        valid_models = [m["id"] for m in self.AVAILABLE_MODELS]
-        if model not in valid_models:
+        if model not in self._VALID_MODEL_IDS:
+            valid_models = [m["id"] for m in self.AVAILABLE_MODELS]
             raise LLMError(
                 "google", 
                 f"Modèle '{model}' non supporté. Modèles disponibles: {valid_models}"
             )
         
+        messages = self._fit_context(messages, model, kwargs.get("max_tokens", 4000))
+        
         # Conversion du format des messages
         gemini_messages = self._convert_messages_to_gemini_format(messages)
         
         # Construction du payload Gemini
         payload = {
             "contents": gemini_messages,
-            "generationConfig": {
-                "temperature": kwargs.get("temperature", self.config.LLM_TEMPERATURE),
-                "maxOutputTokens": kwargs.get("max_tokens", 4000)
-            }
+            "generationConfig": _gemini_generation_config(
+                kwargs.get("temperature", self._default_temperature),
+                kwargs.get("max_tokens", 4000)
+            )
         }
         
-        # URL avec clé API
-        url = (
-            f"https://generativelanguage.googleapis.com/v1beta/models/{model}:"
-            f"generateContent?key={self.config.GOOGLE_API_KEY}"
-        )
-        
-        # Headers Google (pas d'auth dans headers, clé dans URL)
-        headers = {
-            "Content-Type": "application/json"
-        }
+        # URL précalculée (clé API dans les en-têtes)
+        generate_url, stream_url = self._urls[model]
+        url = stream_url if stream else generate_url
         
         logger.debug(f"[Google] Requête avec modèle {model}, {len(gemini_messages)} messages")
+        return url, self._headers, payload
+    
+    async def generate_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        model: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        Génère une completion via l'API Google Gemini.
+        
+        Args:
+            messages: Messages au format OpenAI (convertis automatiquement)
+            model: Modèle Gemini à utiliser
+            **kwargs: Paramètres Gemini
+            
+        Returns:
+            Texte généré par Gemini
+        """
+        url, headers, payload = self._build_request(messages, model, **kwargs)
         
         # Appel API
         response = await self.http_client.post_json(
             url=url,
             headers=headers,
             payload=payload,
-            timeout=self.config.LLM_TIMEOUT,
+            timeout=self._timeout,
             provider="google"
         )
         
@@ -564,17 +799,34 @@ class GoogleProvider(BaseLLMProvider):
             logger.error(f"[Google] Format de réponse invalide: {e}")
             raise LLMError("google", f"Format de réponse invalide: {e}")
     
+    async def stream_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Génère une completion Gemini en streaming (endpoint streamGenerateContent)."""
+        url, headers, payload = self._build_request(messages, model, stream=True, **kwargs)
+        
+        async for event in self.http_client.stream_sse(
+            url, headers, payload, timeout=self._timeout, provider="google"
+        ):
+            for candidate in event.get("candidates", [])[:1]:
+                for part in candidate.get("content", {}).get("parts", []):
+                    text = part.get("text")
+                    if text:
+                        yield text
+    
     async def health_check(self) -> Dict[str, Any]:
         """Vérifie la santé du service Google."""
         try:
-            # Test simple avec Gemini Flash (le plus rapide)
-            test_messages = [{"role": "user", "content": "test"}]
-            
-            await self.generate_completion(
-                test_messages, 
-                model="gemini-1.5-flash",
-                max_tokens=1,
-                temperature=0
+            # Lecture de la fiche du modèle par défaut : valide la clé et le
+            # modèle sans génération (ni latence de prompt, ni tokens facturés)
+            await self.http_client.get_json(
+                f"{_GOOGLE_MODELS_URL}{self.get_default_model()}",
+                headers=self._headers,
+                timeout=self._timeout,
+                provider="google"
             )
             
             return {
@@ -8,9 +8,10 @@ Author: Datasulting
 Version: 2.0.0 - CORRIGÉ avec support du contexte
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Tuple
-from functools import lru_cache
+import time
+from typing import AsyncIterator, Dict, Any, List, Optional, Set, Tuple, Union
 
 from .llm_factory import LLMFactory
 from .exceptions import LLMError, LLMConfigError
@@ -33,20 +34,33 @@ class LLMService:
     _factory: Optional[LLMFactory] = None
     _settings = None
     
+    # Dernier état de santé (horodatage monotone, résultat) : les sondes
+    # fréquentes (load balancer, supervision) ne déclenchent pas chacune
+    # un appel vers tous les fournisseurs
+    _health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+    _health_lock = asyncio.Lock()
+    
     @classmethod
     def _get_factory(cls) -> LLMFactory:
         """
         Récupère l'instance de factory (lazy initialization).
         
+        La construction est synchrone (aucun await entre le test et
+        l'affectation) : deux coroutines ne peuvent pas créer chacune une
+        factory, aucun verrou n'est nécessaire.
+        
         Returns:
             Instance LLMFactory configurée
         """
-        if cls._factory is None:
-            cls._settings = get_settings()
-            cls._factory = LLMFactory(cls._settings)
-            logger.debug("LLMFactory initialisée")
+        # Chemin rapide : une seule lecture d'attribut
+        factory = cls._factory
+        if factory is not None:
+            return factory
         
-        return cls._factory
+        cls._settings = get_settings()
+        cls._factory = factory = LLMFactory(cls._settings)
+        logger.debug("LLMFactory initialisée")
+        return factory
     
     @classmethod
     async def generate_completion(
@@ -93,6 +107,90 @@ class LLMService:
             logger.error(f"Erreur lors de la génération completion: {e}")
             raise
     
+    @classmethod
+    async def generate_completion_batch(
+        cls,
+        conversations: List[List[Dict[str, str]]],
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> List[Union[str, Exception]]:
+        """
+        Génère des completions indépendantes en parallèle.
+        
+        À préférer à une boucle sur generate_completion : la durée totale
+        est proche de celle de l'appel le plus lent. Le nombre d'appels
+        simultanés est borné par LLM_CONCURRENCY (taille du pool HTTP) et
+        les limites de débit éventuelles s'appliquent à chaque appel.
+        
+        Args:
+            conversations: Liste de conversations (une liste de messages chacune)
+            provider: Fournisseur à utiliser (openai, anthropic, google)
+            model: Modèle spécifique à utiliser
+            temperature: Température pour la génération
+            max_tokens: Nombre maximum de tokens
+            
+        Returns:
+            Textes générés, dans l'ordre des conversations ; une erreur est
+            renvoyée à la place du texte pour la conversation concernée
+        """
+        cls._get_factory()
+        semaphore = asyncio.Semaphore(max(cls._settings.LLM_CONCURRENCY, 1))
+        
+        async def _bounded(messages: List[Dict[str, str]]) -> str:
+            async with semaphore:
+                return await cls.generate_completion(
+                    messages, provider=provider, model=model,
+                    temperature=temperature, max_tokens=max_tokens
+                )
+        
+        return await asyncio.gather(
+            *(_bounded(messages) for messages in conversations),
+            return_exceptions=True
+        )
+    
+    @classmethod
+    async def generate_completion_stream(
+        cls,
+        messages: List[Dict[str, str]],
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Génère une completion en streaming (fragments transmis dès leur réception).
+        
+        Args:
+            messages: Liste des messages pour le contexte
+            provider: Fournisseur à utiliser (openai, anthropic, google)
+            model: Modèle spécifique à utiliser
+            temperature: Température pour la génération
+            max_tokens: Nombre maximum de tokens
+            
+        Yields:
+            Fragments de texte générés
+            
+        Raises:
+            LLMError: Si la génération échoue
+        """
+        factory = cls._get_factory()
+        
+        kwargs = {}
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+        
+        async for chunk in factory.generate_completion_stream(
+            messages=messages,
+            provider=provider,
+            model=model,
+            **kwargs
+        ):
+            yield chunk
+    
     @classmethod
     async def generate_sql(
         cls,
@@ -245,13 +343,33 @@ class LLMService:
         """
         Vérifie l'état de santé de tous les services LLM configurés.
         
+        Un état sain est conservé LLM_HEALTH_CACHE_TTL secondes ; à
+        l'expiration, une seule requête rafraîchit l'état, les suivantes
+        attendent son résultat. Un état en erreur n'est pas conservé : le
+        rétablissement d'un provider est visible dès la sonde suivante.
+        
         Returns:
             Dictionnaire avec l'état de chaque service
         """
         factory = cls._get_factory()
+        ttl = cls._settings.LLM_HEALTH_CACHE_TTL
+        
+        cached = cls._health_cache
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
         
         try:
-            return await factory.health_check_all()
+            async with cls._health_lock:
+                cached = cls._health_cache
+                if cached is not None and time.monotonic() - cached[0] < ttl:
+                    return cached[1]
+                
+                health = await factory.health_check_all()
+                if health.get("status") == "ok":
+                    cls._health_cache = (time.monotonic(), health)
+                else:
+                    cls._health_cache = None
+                return health
         except Exception as e:
             logger.error(f"Erreur lors du health check: {e}")
             return {
@@ -302,6 +420,7 @@ class LLMService:
             try:
                 await cls._factory.close()
                 cls._factory = None
+                cls._health_cache = None
                 logger.info("LLMService nettoyé")
             except Exception as e:
                 logger.error(f"Erreur lors du nettoyage LLMService: {e}")
@@ -313,6 +432,18 @@ class LLMService:
 # Ces fonctions maintiennent la compatibilité avec l'ancien code qui appelle
 # directement les fonctions du module llm_service.py
 
+# Fonctions dépréciées déjà signalées : l'avertissement n'est journalisé
+# qu'une fois par processus et non à chaque appel
+_deprecation_warned: Set[str] = set()
+
+
+def _warn_deprecated(name: str, replacement: str):
+    """Journalise une seule fois l'utilisation d'une fonction dépréciée."""
+    if name in _deprecation_warned:
+        return
+    _deprecation_warned.add(name)
+    logger.warning(f"Utilisation de {name}() dépréciée. Utilisez LLMService.{replacement}()")
+
 async def generate_sql(
     user_query: str,
     schema: str,
@@ -327,7 +458,7 @@ async def generate_sql(
     
     DEPRECATED: Utilisez LLMService.generate_sql() à la place.
     """
-    logger.warning("Utilisation de generate_sql() dépréciée. Utilisez LLMService.generate_sql()")
+    _warn_deprecated("generate_sql", "generate_sql")
     return await LLMService.generate_sql(
         user_query=user_query,
         schema=schema,
@@ -352,7 +483,7 @@ async def validate_sql_query(
     
     DEPRECATED: Utilisez LLMService.validate_sql_semantically() à la place.
     """
-    logger.warning("Utilisation de validate_sql_query() dépréciée. Utilisez LLMService.validate_sql_semantically()")
+    _warn_deprecated("validate_sql_query", "validate_sql_semantically")
     return await LLMService.validate_sql_semantically(
         sql_query=sql_query,
         original_request=original_request,
@@ -375,7 +506,7 @@ async def get_sql_explanation(
     
     DEPRECATED: Utilisez LLMService.explain_sql() à la place.
     """
-    logger.warning("Utilisation de get_sql_explanation() dépréciée. Utilisez LLMService.explain_sql()")
+    _warn_deprecated("get_sql_explanation", "explain_sql")
     return await LLMService.explain_sql(
         sql_query=sql_query,
         original_request=original_request,
@@ -395,7 +526,7 @@ async def check_query_relevance(
     
     DEPRECATED: Utilisez LLMService.check_relevance() à la place.
     """
-    logger.warning("Utilisation de check_query_relevance() dépréciée. Utilisez LLMService.check_relevance()")
+    _warn_deprecated("check_query_relevance", "check_relevance")
     return await LLMService.check_relevance(
         user_query=user_query,
         provider=provider,
@@ -409,7 +540,7 @@ async def check_llm_service() -> Dict[str, Any]:
     
     DEPRECATED: Utilisez LLMService.check_services_health() à la place.
     """
-    logger.warning("Utilisation de check_llm_service() dépréciée. Utilisez LLMService.check_services_health()")
+    _warn_deprecated("check_llm_service", "check_services_health")
     return await LLMService.check_services_health()
 
 
@@ -422,11 +553,12 @@ async def initialize_llm_service():
     Initialise le service LLM (appelé au démarrage de l'application).
     """
     try:
-        # Forcer l'initialisation de la factory
-        LLMService._get_factory()
+        # Forcer l'initialisation de la factory et pré-créer la session HTTP
+        factory = LLMService._get_factory()
+        await factory.http_client.startup()
         
-        # Vérifier les providers configurés
-        configured_providers = LLMService.get_configured_providers()
+        # Créer d'avance les providers configurés (hors du chemin de la première requête)
+        configured_providers = factory.warmup()
         logger.info(f"LLMService initialisé avec providers: {configured_providers}")
         
         # Optionnel: vérifier la santé des services
@@ -0,0 +1,127 @@
+"""
+Limiteur de débit côté client pour les appels aux fournisseurs LLM.
+
+Compte les requêtes et les tokens estimés envoyés à un fournisseur sur une
+fenêtre glissante d'une minute, et fait patienter les appels qui
+dépasseraient ses limites (RPM/TPM) au lieu de les laisser échouer en 429.
+Un 429 reçu malgré tout suspend le fournisseur pendant le délai indiqué.
+
+Author: Datasulting
+Version: 2.0.0
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Durée de la fenêtre glissante (secondes)
+_WINDOW = 60.0
+
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int = 0) -> int:
+    """
+    Estimation grossière des tokens d'une requête (≈ 4 caractères par token).
+    
+    Args:
+        messages: Messages de la conversation
+        max_tokens: Tokens de sortie réservés
+    
+    Returns:
+        Nombre de tokens estimé (prompt + sortie)
+    """
+    return sum(len(message["content"]) for message in messages) // 4 + max_tokens
+
+
+class RateLimiter:
+    """
+    Limiteur à fenêtre glissante (requêtes et tokens par minute) d'un fournisseur.
+    
+    Les appels en attente sont servis dans leur ordre d'arrivée.
+    """
+    
+    def __init__(self, name: str, rpm: int, tpm: int):
+        """
+        Initialise le limiteur.
+        
+        Args:
+            name: Nom du fournisseur
+            rpm: Requêtes maximum par minute (0 = illimité)
+            tpm: Tokens maximum par minute (0 = illimité)
+        """
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests: Deque[Tuple[float, int]] = deque()
+        self._tokens = 0
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+        self._waits = 0
+    
+    def _expire(self, now: float):
+        """Retire les requêtes sorties de la fenêtre."""
+        requests = self._requests
+        while requests and now - requests[0][0] >= _WINDOW:
+            self._tokens -= requests.popleft()[1]
+    
+    def _has_capacity(self, tokens: int) -> bool:
+        """Indique si une requête de `tokens` tokens tient dans la fenêtre."""
+        if self.rpm > 0 and len(self._requests) >= self.rpm:
+            return False
+        # Une requête seule plus grosse que la limite passe fenêtre vide
+        if self.tpm > 0 and self._requests and self._tokens + tokens > self.tpm:
+            return False
+        return True
+    
+    async def acquire(self, tokens: int):
+        """
+        Attend qu'une requête puisse être envoyée puis l'enregistre.
+        
+        Args:
+            tokens: Tokens estimés de la requête
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+                
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._has_capacity(tokens):
+                        self._requests.append((now, tokens))
+                        self._tokens += tokens
+                        return
+                    wait = self._requests[0][0] + _WINDOW - now
+                
+                self._waits += 1
+                logger.debug(f"Limite de débit {self.name} atteinte, attente {wait:.2f}s")
+                await asyncio.sleep(wait)
+    
+    def block(self, seconds: float):
+        """
+        Suspend les envois après un 429 du fournisseur.
+        
+        Args:
+            seconds: Délai indiqué par le fournisseur (Retry-After)
+        """
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        logger.warning(f"Fournisseur {self.name} en limite de débit, envois suspendus {seconds}s")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne l'occupation de la fenêtre courante.
+        
+        Returns:
+            Dictionnaire avec requêtes et tokens de la fenêtre, limites et attentes
+        """
+        self._expire(time.monotonic())
+        return {
+            "requests_in_window": len(self._requests),
+            "tokens_in_window": self._tokens,
+            "rpm_limit": self.rpm,
+            "tpm_limit": self.tpm,
+            "waits": self._waits
+        }
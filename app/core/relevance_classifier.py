@@ -0,0 +1,157 @@
+"""
+Classification locale de la pertinence RH d'une question.
+
+Compare l'embedding de la question (déjà calculé pour la recherche
+vectorielle) à deux jeux de questions prototypes, RH et hors sujet.
+Lorsque la question est nettement plus proche des prototypes RH, elle est
+acceptée sans appel LLM. Un rejet n'est jamais décidé localement : les
+questions incertaines ou proches des prototypes hors sujet passent par la
+vérification LLM habituelle.
+
+Author: Datasulting
+Version: 2.0.0
+"""
+
+import logging
+import math
+from operator import mul
+from typing import List, Optional, Tuple
+
+from app.config import get_settings
+from app.core.embedding import get_embeddings
+from app.core.exceptions import EmbeddingError
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Récupérer les paramètres de configuration
+settings = get_settings()
+
+# Questions typiques de la base RH
+_HR_PROTOTYPES = (
+    "Liste des employés actifs",
+    "Combien de salariés sont en CDI ?",
+    "Salaire moyen par service",
+    "Masse salariale du mois dernier",
+    "Quels employés ont été embauchés cette année ?",
+    "Nombre d'absences pour maladie par mois",
+    "Liste des contrats qui se terminent le mois prochain",
+    "Effectif par établissement",
+    "Employés en arrêt de travail actuellement",
+    "Répartition hommes femmes par département",
+    "Ancienneté moyenne des collaborateurs",
+    "Heures supplémentaires payées au dernier trimestre",
+    "Quels salariés sont en période d'essai ?",
+    "Nombre de démissions sur l'année",
+    "Liste des managers et de leurs équipes",
+    "Congés payés restants par employé",
+    "Primes versées en décembre",
+    "Âge moyen des salariés par poste",
+    "Turnover du service commercial",
+    "Date d'entrée et de sortie des intérimaires",
+)
+
+# Questions sans rapport avec les ressources humaines
+_OFF_TOPIC_PROTOTYPES = (
+    "Quel temps fera-t-il demain ?",
+    "Donne-moi une recette de gâteau au chocolat",
+    "Qui a gagné la coupe du monde de football ?",
+    "Traduis cette phrase en anglais",
+    "Quelle est la capitale de l'Australie ?",
+    "Écris un poème sur la mer",
+    "Quel est le cours de l'action Apple ?",
+    "Comment réparer un pneu de vélo ?",
+    "Raconte-moi une blague",
+    "Quels films sortent au cinéma cette semaine ?",
+    "Explique la théorie de la relativité",
+    "Quel est le meilleur restaurant de Paris ?",
+    "Combien de calories dans une pomme ?",
+    "Comment installer Python sur Windows ?",
+    "Horaires des trains pour Lyon",
+    "Qui est le président des États-Unis ?",
+    "Résultats du match d'hier soir",
+    "Conseils pour planter des tomates",
+    "Quelle est la distance entre la Terre et la Lune ?",
+    "Écris une lettre de motivation pour moi",
+)
+
+# Vecteurs normalisés des prototypes (RH, hors sujet), None tant que non initialisés
+_prototypes: Optional[Tuple[Tuple[Tuple[float, ...], ...], Tuple[Tuple[float, ...], ...]]] = None
+
+
+def _normalize(vector: List[float]) -> Tuple[float, ...]:
+    """Retourne le vecteur ramené à une norme unitaire."""
+    norm = math.sqrt(sum(map(mul, vector, vector)))
+    if norm == 0:
+        return tuple(vector)
+    return tuple(value / norm for value in vector)
+
+
+def _max_similarity(query: Tuple[float, ...], prototypes: Tuple[Tuple[float, ...], ...]) -> float:
+    """Similarité cosinus maximale entre la question et un jeu de prototypes."""
+    return max(sum(map(mul, query, prototype)) for prototype in prototypes)
+
+
+async def initialize_relevance_classifier() -> bool:
+    """
+    Calcule les embeddings des questions prototypes.
+    
+    En cas d'échec, le classifieur reste inactif et la pertinence est
+    vérifiée par le LLM comme auparavant.
+    
+    Returns:
+        True si le classifieur est opérationnel, False sinon
+    """
+    global _prototypes
+    
+    if not settings.RELEVANCE_CLASSIFIER_ENABLED:
+        logger.info("Classifieur local de pertinence désactivé")
+        return False
+    
+    try:
+        vectors = await get_embeddings(list(_HR_PROTOTYPES + _OFF_TOPIC_PROTOTYPES))
+    except EmbeddingError as e:
+        logger.warning(f"Classifieur local de pertinence indisponible: {e}")
+        return False
+    
+    normalized = tuple(_normalize(vector) for vector in vectors)
+    _prototypes = (normalized[:len(_HR_PROTOTYPES)], normalized[len(_HR_PROTOTYPES):])
+    logger.info(f"Classifieur local de pertinence initialisé ({len(normalized)} prototypes)")
+    return True
+
+
+def is_relevance_classifier_ready() -> bool:
+    """Indique si les prototypes sont initialisés (classifieur opérationnel)."""
+    return _prototypes is not None
+
+
+def classify_relevance(query_vector: List[float]) -> Optional[bool]:
+    """
+    Classe une question à partir de son embedding.
+    
+    Args:
+        query_vector: Embedding de la question
+    
+    Returns:
+        True (RH) si l'écart de similarité en faveur des prototypes RH atteint
+        RELEVANCE_CLASSIFIER_MARGIN, None si la décision doit revenir au LLM
+        (jamais False : seul le LLM rejette une question)
+    """
+    if _prototypes is None:
+        return None
+    
+    hr_prototypes, off_topic_prototypes = _prototypes
+    query = _normalize(query_vector)
+    margin = _max_similarity(query, hr_prototypes) - _max_similarity(query, off_topic_prototypes)
+    
+    if margin >= settings.RELEVANCE_CLASSIFIER_MARGIN:
+        return True
+    
+    logger.debug(f"Pertinence non confirmée localement (écart {margin:.3f}), vérification par le LLM")
+    return None
+
+
+def cleanup_relevance_classifier():
+    """Libère les vecteurs des prototypes."""
+    global _prototypes
+    _prototypes = None
@@ -1,5 +1,5 @@
 import asyncio
-import concurrent.futures
+import math
 from typing import List, Dict, Any, Optional
 import logging
 from pinecone import Pinecone, PodSpec
@@ -48,6 +48,36 @@ def _normalize_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
     return normalized
 
 
+def _validate_vector_values(query_vector: List[float]):
+    """
+    Vérifie que toutes les valeurs d'un vecteur sont des nombres finis.
+    
+    Une seule somme en C suffit dans le cas nominal (NaN et infini se
+    propagent au total) ; le parcours élément par élément n'a lieu qu'en
+    cas d'anomalie, pour indiquer l'index fautif.
+    
+    Args:
+        query_vector: Vecteur d'embedding à vérifier
+        
+    Raises:
+        VectorSearchError: Si une valeur est non numérique, NaN ou infinie
+    """
+    try:
+        if math.isfinite(sum(query_vector)):
+            return
+    except TypeError:
+        pass
+    
+    for i, value in enumerate(query_vector):
+        if not isinstance(value, (int, float)):
+            raise VectorSearchError(f"Valeur non numérique à l'index {i}: {value}", settings.PINECONE_INDEX_NAME)
+        if not math.isfinite(value):
+            raise VectorSearchError(f"Valeur invalide (NaN ou infini) à l'index {i}: {value}", settings.PINECONE_INDEX_NAME)
+    
+    # Valeurs finies dont la somme déborde : vecteur invalide malgré tout
+    raise VectorSearchError("Valeurs du vecteur hors limites", settings.PINECONE_INDEX_NAME)
+
+
 def _init_pinecone():
     """
     Initialise le client Pinecone et l'index de manière paresseuse.
@@ -135,14 +165,7 @@ def _find_similar_queries_sync(query_vector: List[float], top_k: int) -> List[Di
         top_k = 100
     
     # Vérifier que toutes les valeurs du vecteur sont valides
-    try:
-        for i, value in enumerate(query_vector):
-            if not isinstance(value, (int, float)):
-                raise VectorSearchError(f"Valeur non numérique à l'index {i}: {value}", settings.PINECONE_INDEX_NAME)
-            if isinstance(value, float) and (value != value or value == float('inf') or value == float('-inf')):
-                raise VectorSearchError(f"Valeur invalide (NaN ou infini) à l'index {i}: {value}", settings.PINECONE_INDEX_NAME)
-    except Exception as e:
-        raise VectorSearchError(f"Erreur lors de la validation du vecteur: {e}", settings.PINECONE_INDEX_NAME)
+    _validate_vector_values(query_vector)
     
     index = _init_pinecone()
     
@@ -256,10 +279,8 @@ async def find_similar_queries(query_vector: List[float], top_k: int = 5) -> Lis
     logger.info(f"🔍 Recherche des {top_k} requêtes les plus similaires dans Pinecone")
     
     try:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            similar_queries = await asyncio.get_event_loop().run_in_executor(
-                executor, _find_similar_queries_sync, query_vector, top_k
-            )
+        # Le SDK Pinecone est synchrone : exécution dans le pool par défaut de la boucle
+        similar_queries = await asyncio.to_thread(_find_similar_queries_sync, query_vector, top_k)
         
         logger.info(f"✅ Requêtes similaires trouvées: {len(similar_queries)}")
         return similar_queries
@@ -370,14 +391,7 @@ async def store_query(
         raise VectorSearchError("sql_query doit être une chaîne non vide", settings.PINECONE_INDEX_NAME)
     
     # Vérifier que le vecteur contient des valeurs valides
-    try:
-        for i, value in enumerate(query_vector):
-            if not isinstance(value, (int, float)):
-                raise VectorSearchError(f"Valeur non numérique à l'index {i}: {value}", settings.PINECONE_INDEX_NAME)
-            if isinstance(value, float) and (value != value or value == float('inf') or value == float('-inf')):
-                raise VectorSearchError(f"Valeur invalide (NaN ou infini) à l'index {i}: {value}", settings.PINECONE_INDEX_NAME)
-    except Exception as e:
-        raise VectorSearchError(f"Erreur lors de la validation du vecteur: {e}", settings.PINECONE_INDEX_NAME)
+    _validate_vector_values(query_vector)
     
     try:
         index = _init_pinecone()
@@ -415,8 +429,7 @@ async def store_query(
             )
         
         # Exécuter le stockage de manière asynchrone
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            await asyncio.get_event_loop().run_in_executor(executor, _store_sync)
+        await asyncio.to_thread(_store_sync)
         
         logger.info(f"✅ Requête stockée avec succès dans Pinecone (ID: {query_id})")
         return True
@@ -574,8 +587,7 @@ async def delete_query(query_id: str) -> bool:
         def _delete_sync():
             return index.delete(ids=[query_id.strip()])
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            await asyncio.get_event_loop().run_in_executor(executor, _delete_sync)
+        await asyncio.to_thread(_delete_sync)
         
         logger.info(f"Requête supprimée avec succès (ID: {query_id})")
         return True
@@ -621,8 +633,7 @@ async def search_by_metadata(filter_dict: Dict[str, Any], top_k: int = 10) -> Li
                 include_metadata=True
             )
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            results = await asyncio.get_event_loop().run_in_executor(executor, _search_sync)
+        results = await asyncio.to_thread(_search_sync)
         
         matches = results.get('matches', [])
         logger.debug(f"Recherche par métadonnées: {len(matches)} résultats trouvés")
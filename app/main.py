@@ -7,6 +7,7 @@ from contextlib import asynccontextmanager
 import time
 import os
 import asyncio
+import concurrent.futures
 
 from app.config import get_settings
 from app.api.routes import router
@@ -14,6 +15,7 @@ from app.security import configure_security
 
 # Import des services (Service Layer)
 from app.core.llm_service import initialize_llm_service, cleanup_llm_service
+from app.core.relevance_classifier import initialize_relevance_classifier, cleanup_relevance_classifier
 from app.services.translation_service import TranslationService
 from app.services.validation_service import ValidationService
 
@@ -42,6 +44,14 @@ async def lifespan(app: FastAPI):
     # === STARTUP ===
     logger.info("🚀 Démarrage de NL2SQL API v2.0.0 - Service Layer Architecture")
     
+    # Pool par défaut de la boucle (asyncio.to_thread) dimensionné pour la concurrence attendue
+    asyncio.get_running_loop().set_default_executor(
+        concurrent.futures.ThreadPoolExecutor(
+            max_workers=settings.THREAD_POOL_SIZE,
+            thread_name_prefix="io"
+        )
+    )
+    
     try:
         # 1. Initialiser le service LLM
         logger.info("📡 Initialisation du service LLM...")
@@ -59,6 +69,10 @@ async def lifespan(app: FastAPI):
         translation_service = TranslationService(settings)
         logger.info("✅ Service de traduction initialisé")
         
+        # Classifieur local de pertinence RH (évite un appel LLM par requête)
+        if await initialize_relevance_classifier():
+            logger.info("✅ Classifieur local de pertinence initialisé")
+        
         # 3. Vérifier la santé des services
         logger.info("🔍 Vérification de la santé des services...")
         health_status = await translation_service.get_health_status()
@@ -150,6 +164,8 @@ async def lifespan(app: FastAPI):
         logger.info("✅ Service LLM nettoyé")
         
         # 3. Nettoyer les autres services si nécessaire
+        cleanup_relevance_classifier()
+        
         try:
             from app.core.embedding import cleanup_embedding_service
             await cleanup_embedding_service()
@@ -51,6 +51,11 @@ class PromptManager:
         # Cache des templates compilés
         self._template_cache: Dict[str, Template] = {}
         
+        # Cache des macros résolues et du message système (rendu sans variable)
+        self._macro_cache: Dict[tuple, Any] = {}
+        self._system_message: Optional[str] = None
+        self._available_templates: Optional[List[str]] = None
+        
         # Vérifier que le répertoire existe
         if not self.templates_dir.exists():
             logger.warning(f"Répertoire de templates {self.templates_dir} introuvable")
@@ -98,19 +103,23 @@ class PromptManager:
             ValueError: Si la macro n'existe pas
         """
         try:
-            template = self.get_template(template_name)
-            
-            # Vérifier que la macro existe
-            if macro_name not in template.module.__dict__:
-                available_macros = [name for name in template.module.__dict__.keys() 
-                                  if not name.startswith('_')]
-                raise ValueError(
-                    f"Macro '{macro_name}' introuvable dans {template_name}. "
-                    f"Macros disponibles: {available_macros}"
-                )
+            macro = self._macro_cache.get((template_name, macro_name))
+            if macro is None:
+                template = self.get_template(template_name)
+                
+                # Vérifier que la macro existe
+                if macro_name not in template.module.__dict__:
+                    available_macros = [name for name in template.module.__dict__.keys() 
+                                      if not name.startswith('_')]
+                    raise ValueError(
+                        f"Macro '{macro_name}' introuvable dans {template_name}. "
+                        f"Macros disponibles: {available_macros}"
+                    )
+                
+                macro = getattr(template.module, macro_name)
+                self._macro_cache[(template_name, macro_name)] = macro
             
             # Rendre la macro
-            macro = getattr(template.module, macro_name)
             rendered = macro(**kwargs)
             
             logger.debug(f"Macro {macro_name} rendue depuis {template_name}")
@@ -125,8 +134,10 @@ class PromptManager:
     # ========================================================================
     
     def get_system_message(self) -> str:
-        """Récupère le message système pour la génération SQL."""
-        return self.render_macro('sql_generation.j2', 'system_message')
+        """Récupère le message système pour la génération SQL (rendu une seule fois)."""
+        if self._system_message is None:
+            self._system_message = self.render_macro('sql_generation.j2', 'system_message')
+        return self._system_message
     
     def get_sql_generation_prompt(
         self, 
@@ -298,9 +309,12 @@ class PromptManager:
     # ========================================================================
     
     def list_available_templates(self) -> List[str]:
-        """Retourne la liste des templates disponibles."""
+        """Retourne la liste des templates disponibles (parcours du disque mis en cache)."""
+        if self._available_templates is not None:
+            return list(self._available_templates)
         try:
-            return [f.name for f in self.templates_dir.glob("*.j2")]
+            self._available_templates = [f.name for f in self.templates_dir.glob("*.j2")]
+            return list(self._available_templates)
         except Exception as e:
             logger.error(f"Erreur lors de la liste des templates: {e}")
             return []
@@ -352,6 +366,9 @@ class PromptManager:
     def clear_cache(self):
         """Vide le cache des templates."""
         self._template_cache.clear()
+        self._macro_cache.clear()
+        self._system_message = None
+        self._available_templates = None
         self.get_template.cache_clear()
         logger.info("Cache des templates vidé")
 
@@ -8,6 +8,7 @@ Author: Datasulting
 Version: 2.0.0
 """
 
+import asyncio
 import time
 import logging
 import re
@@ -16,6 +17,7 @@ from app.config import get_settings
 from app.core.embedding import get_embedding
 from app.core.vector_search import find_similar_queries, check_exact_match, store_query
 from app.core.llm_service import LLMService
+from app.core.relevance_classifier import classify_relevance, is_relevance_classifier_ready
 from app.utils.schema_loader import load_schema
 from app.services.validation_service import ValidationService
 from app.utils.cache_decorator import cache_service_method
@@ -126,47 +128,107 @@ class TranslationService:
             if result["status"] == "error":
                 return result
             
-            # 2. Vérification de pertinence RH
-            await self._check_relevance(user_query, provider, model, result)
-            if result["status"] == "error":
-                return result
-            
-            # 3. Chargement du schéma
-            schema = await self._load_schema(schema_path, result)
-            if result["status"] == "error":
-                return result
-            
-            # 4. Recherche vectorielle
-            similar_queries = await self._perform_vector_search(user_query, result)
-            if result["status"] == "error":
-                return result
-            
-            # 5. Formatage des requêtes similaires pour la réponse
-            await self._format_similar_queries_response(
-                similar_queries, return_similar_queries, include_similar_details, result
+            # 2-4. Pertinence RH (LLM), chargement du schéma et recherche vectorielle
+            # sont indépendants : exécutés en parallèle, durée ≈ la plus longue des trois
+            relevance_status, schema_status, search_status = (
+                {"status": result["status"], "validation_message": None} for _ in range(3)
             )
-            
-            # 6. Vérification de correspondance exacte
-            exact_match = await self._check_exact_match(similar_queries, result)
-            
-            if exact_match:
-                # 7a. Traitement correspondance exacte
-                await self._handle_exact_match(exact_match, result)
-            else:
-                # 7b. Génération nouvelle requête SQL
-                await self._generate_new_sql(
-                    user_query, schema, similar_queries, provider, model, result
+            # Embedding calculé une seule fois, partagé par la pertinence et la recherche
+            query_embedding = asyncio.ensure_future(get_embedding(user_query))
+            # La pertinence n'est attendue qu'avant d'exploiter la génération SQL,
+            # qui peut ainsi démarrer pendant la vérification par le LLM
+            # Classifieur inactif : l'appel LLM n'attend pas l'embedding
+            relevance_check = asyncio.ensure_future(
+                self._check_relevance(
+                    user_query, provider, model, relevance_status,
+                    query_embedding if is_relevance_classifier_ready() else None
                 )
+            )
+            sql_generation = None
+            generation_result = {}
+            exact_match = None
             
-            # 8. Validation complète
-            if validate and result["sql"]:
-                await self._perform_complete_validation(
-                    result["sql"], user_query, schema, provider, model, result
+            try:
+                schema, similar_queries = await asyncio.gather(
+                    self._load_schema(schema_path, schema_status),
+                    self._perform_vector_search(user_query, search_status, query_embedding)
                 )
-            
-            # 9. Génération d'explication
-            if explain and result["sql"] and result["status"] != "error":
-                await self._generate_explanation(result["sql"], user_query, provider, model, result)
+                
+                if schema_status["status"] != "error" and search_status["status"] != "error":
+                    # 6. Vérification de correspondance exacte
+                    exact_match = await self._check_exact_match(similar_queries, result)
+                    
+                    if not exact_match and not relevance_check.done():
+                        # 7b. Génération spéculative, écartée si la question est hors sujet
+                        sql_generation = asyncio.ensure_future(self._generate_new_sql(
+                            user_query, schema, similar_queries, provider, model, generation_result
+                        ))
+                
+                await relevance_check
+                
+                # Erreurs remontées dans l'ordre historique des étapes
+                for step_status in (relevance_status, schema_status, search_status):
+                    if step_status["status"] == "error":
+                        result["status"] = "error"
+                        result["validation_message"] = step_status["validation_message"]
+                        return result
+                
+                # 5. Formatage des requêtes similaires pour la réponse
+                await self._format_similar_queries_response(
+                    similar_queries, return_similar_queries, include_similar_details, result
+                )
+                
+                if exact_match:
+                    # 7a. Traitement correspondance exacte
+                    await self._handle_exact_match(exact_match, result)
+                else:
+                    # 7b. Génération nouvelle requête SQL (déjà lancée si possible)
+                    if sql_generation is None:
+                        sql_generation = asyncio.ensure_future(self._generate_new_sql(
+                            user_query, schema, similar_queries, provider, model, generation_result
+                        ))
+                    await sql_generation
+                    result.update(generation_result)
+            
+            finally:
+                # Requête rejetée ou erreur inattendue : abandonner les appels en cours
+                # (une génération mutualisée avec une requête identique se poursuit
+                # pour celle-ci, voir LLMFactory.generate_completion)
+                for pending in (query_embedding, relevance_check, sql_generation):
+                    if pending is None:
+                        continue
+                    if not pending.done():
+                        pending.cancel()
+                    elif not pending.cancelled():
+                        pending.exception()  # Erreur éventuelle marquée comme traitée
+            
+            # 8-9. Validation complète et explication
+            if validate and explain and result["sql"] and result["status"] != "error":
+                # Appels LLM indépendants : l'explication est générée en parallèle
+                # de la validation et n'est conservée que si la requête est validée
+                generated_sql = result["sql"]
+                explanation_result = {}
+                await asyncio.gather(
+                    self._perform_complete_validation(
+                        generated_sql, user_query, schema, provider, model, result
+                    ),
+                    self._generate_explanation(generated_sql, user_query, provider, model, explanation_result)
+                )
+                if result["status"] != "error":
+                    if result["sql"] == generated_sql:
+                        result["explanation"] = explanation_result.get("explanation")
+                    else:
+                        # Requête corrigée par la validation : l'explication
+                        # doit porter sur la requête renvoyée
+                        await self._generate_explanation(result["sql"], user_query, provider, model, result)
+            else:
+                if validate and result["sql"]:
+                    await self._perform_complete_validation(
+                        result["sql"], user_query, schema, provider, model, result
+                    )
+                
+                if explain and result["sql"] and result["status"] != "error":
+                    await self._generate_explanation(result["sql"], user_query, provider, model, result)
             
             # 10. Stockage du résultat
             if store_result and result["valid"] and result["sql"]:
@@ -237,11 +299,25 @@ class TranslationService:
         user_query: str, 
         provider: Optional[str], 
         model: Optional[str], 
-        result: Dict[str, Any]
+        result: Dict[str, Any],
+        query_embedding: Optional[asyncio.Future] = None
     ):
-        """Vérifie la pertinence RH de la requête."""
+        """
+        Vérifie la pertinence RH de la requête.
+        
+        Le classifieur local accepte les questions nettement RH à partir de
+        l'embedding de la question ; toutes les autres sont vérifiées par le LLM.
+        """
         try:
-            is_relevant = await LLMService.check_relevance(user_query, provider=provider, model=model)
+            is_relevant = None
+            if query_embedding is not None:
+                try:
+                    is_relevant = classify_relevance(await query_embedding)
+                except EmbeddingError:
+                    pass  # Erreur signalée par l'étape de recherche vectorielle
+            
+            if is_relevant is None:
+                is_relevant = await LLMService.check_relevance(user_query, provider=provider, model=model)
             
             if not is_relevant:
                 result["status"] = "error"
@@ -286,11 +362,16 @@ class TranslationService:
             result["validation_message"] = f"Erreur de chargement du schéma: {str(e)}"
             return None
     
-    async def _perform_vector_search(self, user_query: str, result: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    async def _perform_vector_search(
+        self,
+        user_query: str,
+        result: Dict[str, Any],
+        query_embedding: Optional[asyncio.Future] = None
+    ) -> Optional[List[Dict[str, Any]]]:
         """Effectue la recherche vectorielle."""
         try:
-            # Vectorisation
-            query_vector = await get_embedding(user_query)
+            # Vectorisation (réutilise l'embedding déjà lancé s'il est fourni)
+            query_vector = await (query_embedding if query_embedding is not None else get_embedding(user_query))
             
             # Recherche des requêtes similaires
             similar_queries = await find_similar_queries(query_vector, self.config.TOP_K_RESULTS)
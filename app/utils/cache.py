@@ -3,6 +3,7 @@ import json
 import logging
 import hashlib
 from typing import Any, Optional, Dict, Tuple, Union
+import orjson
 import redis.asyncio as redis
 import asyncio
 import time
@@ -164,8 +165,8 @@ async def cache_get(key: str) -> Optional[Dict[str, Any]]:
             logger.debug(f"Cache hit pour la clé: {key[:50]}...")
             
             try:
-                return json.loads(cached_value)
-            except json.JSONDecodeError as e:
+                return orjson.loads(cached_value)
+            except orjson.JSONDecodeError as e:
                 logger.error(f"Données cache corrompues pour la clé {key}: {e}")
                 # Supprimer la clé corrompue
                 try:
@@ -240,10 +241,10 @@ async def cache_set(key: str, value: Dict[str, Any], ttl: int = REDIS_TTL) -> bo
         return False
     
     try:
-        # Sérialiser la valeur
+        # Sérialiser la valeur (orjson : octets UTF-8 compacts, sans passage par str)
         try:
-            value_json = json.dumps(value, ensure_ascii=True, separators=(',', ':'))
-        except (TypeError, ValueError) as e:
+            value_json = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError as e:
             logger.error(f"Erreur de sérialisation JSON: {e}")
             return False
         
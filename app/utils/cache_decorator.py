@@ -15,6 +15,8 @@ import time
 from functools import wraps
 from typing import Any, Dict, Optional
 
+import orjson
+
 from app.utils.cache import get_redis_client, CACHE_ENABLED, REDIS_TTL
 from app.core.exceptions import CacheError
 
@@ -172,7 +174,7 @@ async def _get_from_cache(cache_key: str) -> Optional[Dict[str, Any]]:
     try:
         cached_value = await client.get(cache_key)
         if cached_value:
-            return json.loads(cached_value)
+            return orjson.loads(cached_value)
         return None
     
     except Exception as e:
@@ -200,8 +202,8 @@ async def _store_in_cache(cache_key: str, value: Dict[str, Any], ttl: int) -> bo
         return False
     
     try:
-        # Sérialiser la valeur
-        value_json = json.dumps(value, ensure_ascii=True, separators=(',', ':'), default=str)
+        # Sérialiser la valeur (orjson : octets UTF-8 compacts, sans passage par str)
+        value_json = orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
         
         # Vérifier la taille (limiter à 10MB)
         if len(value_json) > 10 * 1024 * 1024:
@@ -0,0 +1,11 @@
+"""
+Configuration commune des tests.
+
+Les paramètres de l'application exigent des clés API : des valeurs
+factices sont fournies lorsqu'elles ne sont pas définies dans l'environnement.
+"""
+
+import os
+
+os.environ.setdefault("PINECONE_API_KEY", "test-pinecone-key")
+os.environ.setdefault("OPENAI_API_KEY", "test-openai-key")
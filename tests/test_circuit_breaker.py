@@ -0,0 +1,91 @@
+"""
+Tests du disjoncteur des fournisseurs LLM.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import circuit_breaker
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Horloge monotone contrôlée par le test."""
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_opens_after_threshold(clock):
+    breaker = CircuitBreaker("openai", failure_threshold=3, reset_timeout=30.0)
+    
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+    
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker("openai", failure_threshold=2)
+    
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.get_stats()["consecutive_failures"] == 1
+
+
+def test_zero_threshold_never_opens(clock):
+    breaker = CircuitBreaker("openai", failure_threshold=0)
+    
+    for _ in range(10):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_half_open_allows_a_single_trial(clock):
+    breaker = CircuitBreaker("openai", failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    
+    clock[0] += 29.0
+    assert not breaker.allow_request()
+    
+    clock[0] += 1.0
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    # Appel d'essai en cours : les suivants restent refusés
+    assert not breaker.allow_request()
+
+
+def test_half_open_success_closes(clock):
+    breaker = CircuitBreaker("openai", failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    clock[0] += 30.0
+    assert breaker.allow_request()
+    
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_half_open_failure_reopens(clock):
+    breaker = CircuitBreaker("openai", failure_threshold=3, reset_timeout=30.0)
+    for _ in range(3):
+        breaker.record_failure()
+    clock[0] += 30.0
+    assert breaker.allow_request()
+    
+    # Un seul échec de l'appel d'essai suffit à rouvrir le circuit
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    
+    clock[0] += 30.0
+    assert breaker.allow_request()
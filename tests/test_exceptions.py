@@ -0,0 +1,36 @@
+"""
+Tests des exceptions de l'application (sérialisation).
+"""
+
+import copy
+import pickle
+
+import pytest
+
+from app.core.exceptions import (
+    LLMAuthError, LLMConfigError, LLMError, LLMNetworkError, LLMQuotaError
+)
+
+
+@pytest.mark.parametrize("error", [
+    LLMError("openai", "Requête invalide", 400, {"field": "model"}),
+    LLMNetworkError("anthropic", "Timeout", TimeoutError("lecture")),
+    LLMAuthError("google"),
+    LLMQuotaError("openai", retry_after=12.0),
+    LLMConfigError("openai", "OPENAI_API_KEY manquante"),
+])
+@pytest.mark.parametrize("clone", [lambda e: pickle.loads(pickle.dumps(e)), copy.copy, copy.deepcopy])
+def test_llm_errors_round_trip(error, clone):
+    restored = clone(error)
+    
+    assert type(restored) is type(error)
+    assert restored.provider == error.provider
+    assert restored.message == error.message
+    assert restored.status_code == error.status_code
+    assert restored.details == error.details
+    assert str(restored) == str(error)
+
+
+def test_quota_error_keeps_retry_after():
+    restored = pickle.loads(pickle.dumps(LLMQuotaError("openai", retry_after=12.0)))
+    assert restored.details["retry_after"] == 12.0
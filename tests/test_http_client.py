@@ -0,0 +1,49 @@
+"""
+Tests du client HTTP partagé (nouvelles tentatives sur 429).
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.exceptions import LLMQuotaError
+from app.core.http_client import HTTPClient
+
+
+def make_client(responses):
+    """Client dont les réponses successives sont simulées."""
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        return responses[min(len(calls), len(responses)) - 1]
+    
+    client = HTTPClient(max_retries=3)
+    client._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._session_ready = True
+    return client, calls
+
+
+def test_short_retry_after_is_retried():
+    client, calls = make_client([
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"ok": True}),
+    ])
+    
+    result = asyncio.run(client.post_json("https://llm.test/v1", {}, {}, provider="openai"))
+    assert result == {"ok": True}
+    assert len(calls) == 2
+
+
+def test_long_retry_after_fails_fast():
+    client, calls = make_client([httpx.Response(429, headers={"Retry-After": "20"})])
+    
+    with pytest.raises(LLMQuotaError) as exc_info:
+        asyncio.run(asyncio.wait_for(
+            client.post_json("https://llm.test/v1", {}, {}, provider="openai"),
+            timeout=2
+        ))
+    # Pas d'attente : le délai annoncé est transmis au limiteur de débit
+    assert len(calls) == 1
+    assert exc_info.value.details["retry_after"] == 20
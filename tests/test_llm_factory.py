@@ -0,0 +1,204 @@
+"""
+Tests de la factory LLM (verdicts, pertinence, mutualisation, disjoncteur).
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import llm_cache
+from app.core.exceptions import LLMError, LLMNetworkError
+from app.core.llm_factory import LLMFactory
+
+
+def make_config(**overrides):
+    """Configuration minimale de la factory pour les tests."""
+    values = {
+        "DEFAULT_PROVIDER": "openai",
+        "FALLBACK_PROVIDER": None,
+        "LLM_TEMPERATURE": 0.2,
+        "LLM_CONCURRENCY": 10,
+        "LLM_CACHE_SIZE": 0,
+        "LLM_CACHE_TTL": 3600,
+        "LLM_RATE_LIMIT_ENABLED": False,
+        "LLM_MAX_CONCURRENT_PER_PROVIDER": 0,
+        "CIRCUIT_BREAKER_THRESHOLD": 5,
+        "CIRCUIT_BREAKER_RESET_TIMEOUT": 30.0,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class FakeProvider:
+    """Provider simulé : renvoie une réponse fixe ou lève une erreur."""
+    
+    def __init__(self, response="OUI", error=None, delay=0.0):
+        self.response = response
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+    
+    async def generate_completion(self, messages, model=None, **kwargs):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+def make_factory(providers, **overrides):
+    """Factory dont les providers sont remplacés par des providers simulés."""
+    factory = LLMFactory(make_config(**overrides))
+    factory._provider_instances.update(providers)
+    # Prompts par défaut, sans chargement du PromptManager
+    factory._prompt_manager_loaded = True
+    return factory
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    """Désactive le niveau Redis du cache des réponses LLM."""
+    async def cache_get(key):
+        return None
+    
+    async def cache_set(key, value, ttl=None):
+        return True
+    
+    async def cache_invalidate(key):
+        return True
+    
+    monkeypatch.setattr(llm_cache, "cache_get", cache_get)
+    monkeypatch.setattr(llm_cache, "cache_set", cache_set)
+    monkeypatch.setattr(llm_cache, "cache_invalidate", cache_invalidate)
+
+
+@pytest.mark.parametrize("response, expected", [
+    ("OUI", "OUI"),
+    ("non", "NON"),
+    ("HORS_SUJET", "HORS_SUJET"),
+    ("Hors sujet", "HORS_SUJET"),
+    ("La requête concerne bien la base RH. OUI", "OUI"),
+    ("Je ne sais pas", None),
+    ("", None),
+])
+def test_parse_verdict(response, expected):
+    assert LLMFactory._parse_verdict(response) == expected
+
+
+@pytest.mark.parametrize("response, expected", [
+    # HORS_SUJET l'emporte sur OUI, qui l'emporte sur NON, quel que soit l'ordre
+    ("Non pertinent pour la base... HORS_SUJET", "HORS_SUJET"),
+    ("OUI, hors sujet malgré tout", "HORS_SUJET"),
+    ("OUI ... mais NON", "OUI"),
+    ("NON ... enfin OUI", "OUI"),
+])
+def test_parse_verdict_priority(response, expected):
+    assert LLMFactory._parse_verdict(response) == expected
+
+
+def test_check_relevance_without_verdict_is_relevant_and_not_cached(no_redis):
+    provider = FakeProvider("La question porte sur les effectifs de l'entreprise")
+    factory = make_factory({"openai": provider}, LLM_CACHE_SIZE=16)
+    
+    assert asyncio.run(factory.check_relevance("Effectif par service")) is True
+    assert factory.response_cache.get_stats()["size"] == 0
+    
+    # Question réévaluée au lieu d'être servie depuis le cache
+    asyncio.run(factory.check_relevance("Effectif par service"))
+    assert provider.calls == 2
+
+
+def test_check_relevance_with_preamble(no_redis):
+    provider = FakeProvider("La requête concerne bien les salariés de la base. OUI")
+    factory = make_factory({"openai": provider}, LLM_CACHE_SIZE=16)
+    
+    assert asyncio.run(factory.check_relevance("Liste des salariés")) is True
+    assert factory.response_cache.get_stats()["size"] == 1
+
+
+def test_check_relevance_off_topic():
+    factory = make_factory({"openai": FakeProvider("HORS_SUJET")})
+    
+    assert asyncio.run(factory.check_relevance("Quel temps fera-t-il demain ?")) is False
+
+
+def test_cancelled_caller_does_not_cancel_identical_call():
+    async def scenario():
+        provider = FakeProvider("SELECT 1;", delay=0.05)
+        factory = make_factory({"openai": provider})
+        messages = [{"role": "user", "content": "Liste des employés"}]
+        
+        first = asyncio.create_task(factory.generate_completion(messages, temperature=0.0))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(factory.generate_completion(messages, temperature=0.0))
+        await asyncio.sleep(0.01)
+        
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        
+        assert await second == "SELECT 1;"
+        assert provider.calls == 1
+        assert factory._inflight == {}
+    
+    asyncio.run(scenario())
+
+
+def test_cancelled_only_caller_cancels_provider_call():
+    async def scenario():
+        provider = FakeProvider("SELECT 1;", delay=10)
+        factory = make_factory({"openai": provider})
+        messages = [{"role": "user", "content": "Liste des employés"}]
+        
+        call = asyncio.create_task(factory.generate_completion(messages, temperature=0.0))
+        await asyncio.sleep(0.01)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        
+        assert factory._inflight == {}
+    
+    asyncio.run(asyncio.wait_for(scenario(), timeout=2))
+
+
+def test_open_circuit_routes_to_fallback():
+    primary = FakeProvider(error=LLMNetworkError("openai", "Timeout"))
+    fallback = FakeProvider("SELECT 1;")
+    factory = make_factory(
+        {"openai": primary, "anthropic": fallback},
+        CIRCUIT_BREAKER_THRESHOLD=1,
+        FALLBACK_PROVIDER="anthropic"
+    )
+    messages = [{"role": "user", "content": "Liste des employés"}]
+    
+    with pytest.raises(LLMNetworkError):
+        asyncio.run(factory.generate_completion(messages))
+    
+    # Circuit ouvert : le provider principal n'est plus appelé
+    assert asyncio.run(factory.generate_completion(messages)) == "SELECT 1;"
+    assert primary.calls == 1
+    assert fallback.calls == 1
+
+
+def test_open_circuit_without_fallback_fails_fast():
+    primary = FakeProvider(error=LLMNetworkError("openai", "Timeout"))
+    factory = make_factory({"openai": primary}, CIRCUIT_BREAKER_THRESHOLD=1)
+    messages = [{"role": "user", "content": "Liste des employés"}]
+    
+    for _ in range(2):
+        with pytest.raises(LLMNetworkError):
+            asyncio.run(factory.generate_completion(messages))
+    assert primary.calls == 1
+
+
+def test_client_errors_do_not_open_circuit():
+    primary = FakeProvider(error=LLMError("openai", "Requête invalide", 400))
+    factory = make_factory({"openai": primary}, CIRCUIT_BREAKER_THRESHOLD=1)
+    messages = [{"role": "user", "content": "Liste des employés"}]
+    
+    for _ in range(2):
+        with pytest.raises(LLMError):
+            asyncio.run(factory.generate_completion(messages))
+    assert primary.calls == 2
@@ -0,0 +1,53 @@
+"""
+Tests des providers LLM (ajustement au contexte du modèle).
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.exceptions import LLMError
+from app.core.llm_providers import OpenAIProvider
+
+
+@pytest.fixture
+def provider():
+    """Provider OpenAI avec un modèle fictif de 1000 tokens de contexte."""
+    config = SimpleNamespace(
+        OPENAI_API_KEY="test-openai-key",
+        LLM_TIMEOUT=30,
+        LLM_TEMPERATURE=0.2,
+        DEFAULT_OPENAI_MODEL="gpt-4o"
+    )
+    provider = OpenAIProvider(config)
+    provider._CONTEXT_LENGTHS = {"tiny": 1000}
+    return provider
+
+
+def test_fit_context_unknown_model_unchanged(provider):
+    messages = [{"role": "user", "content": "a" * 100_000}]
+    assert provider._fit_context(messages, "inconnu", 100) is messages
+
+
+def test_fit_context_within_limit_unchanged(provider):
+    messages = [{"role": "system", "content": "s" * 400}, {"role": "user", "content": "u" * 400}]
+    assert provider._fit_context(messages, "tiny", 100) is messages
+
+
+def test_fit_context_drops_oldest_turns(provider):
+    system = {"role": "system", "content": "s" * 400}
+    old_question = {"role": "user", "content": "q" * 2000}
+    old_answer = {"role": "assistant", "content": "r" * 2000}
+    question = {"role": "user", "content": "u" * 400}
+    
+    # ≈ 1200 tokens estimés pour 872 disponibles : seul le tour le plus ancien est retiré
+    fitted = provider._fit_context([system, old_question, old_answer, question], "tiny", 0)
+    assert fitted == [system, old_answer, question]
+
+
+def test_fit_context_too_long_raises_400(provider):
+    messages = [{"role": "system", "content": "s" * 400}, {"role": "user", "content": "u" * 4000}]
+    
+    with pytest.raises(LLMError) as exc_info:
+        provider._fit_context(messages, "tiny", 0)
+    assert exc_info.value.status_code == 400
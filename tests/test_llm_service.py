@@ -0,0 +1,50 @@
+"""
+Tests du cache de l'état de santé de LLMService.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.llm_service import LLMService
+
+
+class FakeFactory:
+    """Factory simulée : renvoie l'état de santé courant et compte les appels."""
+    
+    def __init__(self, status):
+        self.status = status
+        self.calls = 0
+    
+    async def health_check_all(self):
+        self.calls += 1
+        return {"status": self.status, "default_provider": "openai", "providers": {}}
+
+
+@pytest.fixture
+def health_factory(monkeypatch):
+    """Installe une factory simulée et vide le cache de santé."""
+    factory = FakeFactory("error")
+    monkeypatch.setattr(LLMService, "_factory", factory)
+    monkeypatch.setattr(LLMService, "_settings", SimpleNamespace(LLM_HEALTH_CACHE_TTL=60.0, DEFAULT_PROVIDER="openai"))
+    monkeypatch.setattr(LLMService, "_health_cache", None)
+    monkeypatch.setattr(LLMService, "_health_lock", asyncio.Lock())
+    return factory
+
+
+def test_error_health_is_not_cached(health_factory):
+    assert asyncio.run(LLMService.check_services_health())["status"] == "error"
+    
+    # Provider rétabli : visible dès la sonde suivante
+    health_factory.status = "ok"
+    assert asyncio.run(LLMService.check_services_health())["status"] == "ok"
+    assert health_factory.calls == 2
+
+
+def test_ok_health_is_cached(health_factory):
+    health_factory.status = "ok"
+    
+    for _ in range(3):
+        assert asyncio.run(LLMService.check_services_health())["status"] == "ok"
+    assert health_factory.calls == 1
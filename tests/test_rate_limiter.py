@@ -0,0 +1,79 @@
+"""
+Tests du limiteur de débit des fournisseurs LLM.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core import rate_limiter
+from app.core.rate_limiter import RateLimiter, estimate_tokens
+
+
+@pytest.fixture(autouse=True)
+def short_window(monkeypatch):
+    """Fenêtre glissante raccourcie pour des tests rapides."""
+    monkeypatch.setattr(rate_limiter, "_WINDOW", 0.2)
+
+
+def test_estimate_tokens():
+    messages = [{"role": "user", "content": "a" * 400}]
+    assert estimate_tokens(messages) == 100
+    assert estimate_tokens(messages, max_tokens=50) == 150
+
+
+def test_requests_per_window():
+    async def scenario():
+        limiter = RateLimiter("openai", rpm=2, tpm=0)
+        start = time.monotonic()
+        await limiter.acquire(10)
+        await limiter.acquire(10)
+        assert time.monotonic() - start < 0.1
+        
+        # Troisième requête : attente de la sortie de la première de la fenêtre
+        await limiter.acquire(10)
+        assert time.monotonic() - start >= 0.2
+        assert limiter.get_stats()["waits"] >= 1
+    
+    asyncio.run(scenario())
+
+
+def test_tokens_per_window():
+    async def scenario():
+        limiter = RateLimiter("openai", rpm=0, tpm=100)
+        start = time.monotonic()
+        
+        # Requête seule plus grosse que la limite : acceptée fenêtre vide
+        await limiter.acquire(150)
+        assert time.monotonic() - start < 0.1
+        
+        await limiter.acquire(10)
+        assert time.monotonic() - start >= 0.2
+    
+    asyncio.run(scenario())
+
+
+def test_block_suspends_requests():
+    async def scenario():
+        limiter = RateLimiter("openai", rpm=0, tpm=0)
+        limiter.block(0.15)
+        start = time.monotonic()
+        await limiter.acquire(10)
+        assert time.monotonic() - start >= 0.15
+    
+    asyncio.run(scenario())
+
+
+def test_stats_expire_with_window():
+    async def scenario():
+        limiter = RateLimiter("openai", rpm=10, tpm=1000)
+        await limiter.acquire(30)
+        assert limiter.get_stats()["requests_in_window"] == 1
+        assert limiter.get_stats()["tokens_in_window"] == 30
+        
+        await asyncio.sleep(0.25)
+        assert limiter.get_stats()["requests_in_window"] == 0
+        assert limiter.get_stats()["tokens_in_window"] == 0
+    
+    asyncio.run(scenario())
@@ -0,0 +1,44 @@
+"""
+Tests du classifieur local de pertinence RH.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import relevance_classifier
+from app.core.relevance_classifier import classify_relevance, is_relevance_classifier_ready
+
+
+@pytest.fixture
+def prototypes(monkeypatch):
+    """Prototypes RH et hors sujet orthogonaux, écart minimal de 0.1."""
+    monkeypatch.setattr(relevance_classifier, "_prototypes", (((1.0, 0.0, 0.0),), ((0.0, 1.0, 0.0),)))
+    monkeypatch.setattr(relevance_classifier, "settings", SimpleNamespace(RELEVANCE_CLASSIFIER_MARGIN=0.1))
+
+
+def test_not_initialized_defers_to_llm(monkeypatch):
+    monkeypatch.setattr(relevance_classifier, "_prototypes", None)
+    assert not is_relevance_classifier_ready()
+    assert classify_relevance([1.0, 0.0, 0.0]) is None
+
+
+def test_clear_hr_question_is_relevant(prototypes):
+    assert is_relevance_classifier_ready()
+    assert classify_relevance([1.0, 0.0, 0.0]) is True
+
+
+def test_hr_question_above_margin_is_relevant(prototypes):
+    # Écart de similarité ≈ 0.128
+    assert classify_relevance([0.6, 0.5, 0.0]) is True
+
+
+def test_hr_question_below_margin_defers_to_llm(prototypes):
+    # Écart de similarité ≈ 0.067
+    assert classify_relevance([0.55, 0.5, 0.0]) is None
+
+
+def test_off_topic_question_defers_to_llm(prototypes):
+    # Jamais de rejet local, même loin des prototypes RH
+    assert classify_relevance([0.5, 0.6, 0.0]) is None
+    assert classify_relevance([0.0, 1.0, 0.0]) is None
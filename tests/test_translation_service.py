@@ -0,0 +1,188 @@
+"""
+Tests de l'orchestration de TranslationService.translate (étapes simulées).
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.exceptions import EmbeddingError
+from app.services import translation_service
+from app.services.translation_service import TranslationService
+
+GENERATED_SQL = "SELECT nom FROM employes WHERE id_user = ?;"
+FIXED_SQL = "SELECT nom FROM employes WHERE id_user = ? AND actif = 1;"
+
+
+class FakeLLMService:
+    """LLMService simulé : réponses fixes et appels enregistrés."""
+    
+    def __init__(self, relevant=True, relevance_delay=0.0, generation_delay=0.0):
+        self.relevant = relevant
+        self.relevance_delay = relevance_delay
+        self.generation_delay = generation_delay
+        self.explained = []
+        self.relevance_checks = 0
+        self.generation_cancelled = False
+    
+    async def check_relevance(self, user_query, provider=None, model=None):
+        self.relevance_checks += 1
+        await asyncio.sleep(self.relevance_delay)
+        return self.relevant
+    
+    async def generate_sql(self, user_query, schema, similar_queries=None, provider=None, model=None, context=None):
+        try:
+            await asyncio.sleep(self.generation_delay)
+        except asyncio.CancelledError:
+            self.generation_cancelled = True
+            raise
+        return GENERATED_SQL
+    
+    async def explain_sql(self, sql_query, original_request, provider=None, model=None, context=None):
+        self.explained.append(sql_query)
+        return f"Explication de {sql_query}"
+
+
+@pytest.fixture
+def steps(monkeypatch):
+    """Étapes externes simulées (embedding, schéma, Pinecone, LLM)."""
+    llm = FakeLLMService()
+    
+    async def get_embedding(text):
+        return [0.1] * 768
+    
+    async def load_schema(path):
+        return "CREATE TABLE employes (id_user INT, nom TEXT, actif INT);"
+    
+    async def find_similar_queries(vector, top_k):
+        return []
+    
+    async def check_exact_match(similar_queries, threshold):
+        return None
+    
+    monkeypatch.setattr(translation_service, "get_embedding", get_embedding)
+    monkeypatch.setattr(translation_service, "load_schema", load_schema)
+    monkeypatch.setattr(translation_service, "find_similar_queries", find_similar_queries)
+    monkeypatch.setattr(translation_service, "check_exact_match", check_exact_match)
+    monkeypatch.setattr(translation_service, "classify_relevance", lambda vector: None)
+    monkeypatch.setattr(translation_service, "is_relevance_classifier_ready", lambda: False)
+    monkeypatch.setattr(translation_service, "LLMService", llm)
+    return llm
+
+
+def make_service(fixed_sql=None):
+    """Service dont la validation complète renvoie la requête (corrigée si demandé)."""
+    service = TranslationService()
+    
+    async def validate_complete(sql_query, original_request=None, schema=None, provider=None, model=None, auto_fix=True):
+        final_query = fixed_sql or sql_query
+        return {
+            "valid": True,
+            "final_query": final_query,
+            "message": "Requête valide",
+            "auto_fix_applied": final_query != sql_query,
+            "details": {"framework": {"compliant": True}}
+        }
+    
+    service.validation_service.validate_complete = validate_complete
+    return service
+
+
+def translate(service, query="Liste des employés actifs"):
+    return asyncio.run(asyncio.wait_for(service.translate(query, use_cache=False), timeout=5))
+
+
+def test_translate_success(steps):
+    result = translate(make_service())
+    
+    assert result["status"] == "success"
+    assert result["sql"] == GENERATED_SQL
+    assert result["explanation"] == f"Explication de {GENERATED_SQL}"
+
+
+def test_explanation_matches_auto_fixed_query(steps):
+    result = translate(make_service(fixed_sql=FIXED_SQL))
+    
+    assert result["sql"] == FIXED_SQL
+    assert result["explanation"] == f"Explication de {FIXED_SQL}"
+    assert "corrigée automatiquement" in result["validation_message"]
+
+
+def test_llm_relevance_check_does_not_wait_for_embedding(steps, monkeypatch):
+    embedding_done = asyncio.Event()
+    relevance_started_before_embedding = []
+    
+    async def get_embedding(text):
+        await asyncio.sleep(0.05)
+        embedding_done.set()
+        return [0.1] * 768
+    
+    async def check_relevance(user_query, provider=None, model=None):
+        relevance_started_before_embedding.append(not embedding_done.is_set())
+        return True
+    
+    monkeypatch.setattr(translation_service, "get_embedding", get_embedding)
+    monkeypatch.setattr(steps, "check_relevance", check_relevance)
+    result = translate(make_service())
+    
+    assert result["status"] == "success"
+    assert relevance_started_before_embedding == [True]
+
+
+def test_ready_classifier_skips_llm_relevance_check(steps, monkeypatch):
+    monkeypatch.setattr(translation_service, "is_relevance_classifier_ready", lambda: True)
+    monkeypatch.setattr(translation_service, "classify_relevance", lambda vector: True)
+    result = translate(make_service())
+    
+    assert result["status"] == "success"
+    assert steps.relevance_checks == 0
+
+
+def test_off_topic_cancels_speculative_generation(steps):
+    steps.relevant = False
+    steps.relevance_delay = 0.05
+    steps.generation_delay = 10
+    
+    result = translate(make_service())
+    
+    assert result["status"] == "error"
+    assert "ressources humaines" in result["validation_message"]
+    assert result["sql"] is None
+    assert steps.generation_cancelled
+    assert steps.explained == []
+
+
+def test_relevance_error_reported_before_schema_error(steps, monkeypatch):
+    steps.relevant = False
+    
+    async def load_schema(path):
+        raise FileNotFoundError(path)
+    
+    monkeypatch.setattr(translation_service, "load_schema", load_schema)
+    result = translate(make_service())
+    
+    assert result["status"] == "error"
+    assert "ressources humaines" in result["validation_message"]
+
+
+def test_schema_error_reported(steps, monkeypatch):
+    async def load_schema(path):
+        raise FileNotFoundError(path)
+    
+    monkeypatch.setattr(translation_service, "load_schema", load_schema)
+    result = translate(make_service())
+    
+    assert result["status"] == "error"
+    assert "schéma introuvable" in result["validation_message"]
+
+
+def test_embedding_error_reported(steps, monkeypatch):
+    async def get_embedding(text):
+        raise EmbeddingError("API indisponible")
+    
+    monkeypatch.setattr(translation_service, "get_embedding", get_embedding)
+    result = translate(make_service())
+    
+    assert result["status"] == "error"
+    assert "vectorisation" in result["validation_message"]
+    assert steps.explained == []
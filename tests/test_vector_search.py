@@ -0,0 +1,73 @@
+"""
+Tests de la recherche vectorielle (validation des vecteurs).
+"""
+
+import asyncio
+
+import pytest
+
+from app.core import vector_search
+from app.core.exceptions import VectorSearchError
+
+
+class FakeIndex:
+    """Index Pinecone simulé."""
+    
+    def __init__(self):
+        self.queries = []
+        self.upserts = []
+    
+    def query(self, vector, top_k, include_metadata):
+        self.queries.append(vector)
+        return {"matches": [{"id": "1", "score": 0.9, "metadata": {"requete": "SELECT 1;", "texte_complet": "Test"}}]}
+    
+    def upsert(self, vectors):
+        self.upserts.append(vectors)
+
+
+@pytest.fixture
+def index(monkeypatch):
+    fake = FakeIndex()
+    monkeypatch.setattr(vector_search, "_init_pinecone", lambda: fake)
+    return fake
+
+
+def test_find_similar_queries_with_valid_vector(index):
+    matches = vector_search._find_similar_queries_sync([0.1] * 768, 5)
+    
+    assert len(matches) == 1
+    assert matches[0]["metadata"]["requete"] == "SELECT 1;"
+    assert len(index.queries) == 1
+
+
+def test_find_similar_queries_rejects_nan(index):
+    vector = [0.1] * 768
+    vector[42] = float("nan")
+    
+    with pytest.raises(VectorSearchError, match="index 42"):
+        vector_search._find_similar_queries_sync(vector, 5)
+    assert index.queries == []
+
+
+def test_find_similar_queries_rejects_non_numeric(index):
+    vector = [0.1] * 768
+    vector[3] = "x"
+    
+    with pytest.raises(VectorSearchError, match="index 3"):
+        vector_search._find_similar_queries_sync(vector, 5)
+
+
+def test_store_query_with_valid_vector(index):
+    stored = asyncio.run(vector_search.store_query("Liste des employés", [0.1] * 768, "SELECT 1;"))
+    
+    assert stored is True
+    assert len(index.upserts) == 1
+
+
+def test_store_query_rejects_infinite(index):
+    vector = [0.1] * 768
+    vector[0] = float("inf")
+    
+    with pytest.raises(VectorSearchError, match="index 0"):
+        asyncio.run(vector_search.store_query("Liste des employés", vector, "SELECT 1;"))
+    assert index.upserts == []